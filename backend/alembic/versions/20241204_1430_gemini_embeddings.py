@@ -17,15 +17,39 @@ branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
 
+def _embedding_dim(conn) -> int | None:
+    """Return the current dimension of chunks.embedding (vector typmod), if any."""
+    return conn.execute(sa.text(
+        "SELECT atttypmod FROM pg_attribute "
+        "WHERE attrelid = 'chunks'::regclass AND attname = 'embedding'"
+    )).scalar()
+
+
 def upgrade() -> None:
     """
     Change vector dimension from 1536 (OpenAI) to 768 (Gemini).
     
     Note: This will delete existing chunks since we can't convert dimensions.
     Run this before uploading any documents, or re-process existing documents.
+
+    Index builds assume ~2GB of maintenance_work_mem is available.
     """
-    # Drop the existing HNSW index
-    op.execute('DROP INDEX IF EXISTS ix_chunks_embedding_hnsw')
+    # Fresh installs already create vector(768) in 001_initial — the whole
+    # 002/003/004 chain is then a no-op, skipping three table rewrites and
+    # three HNSW builds.
+    if _embedding_dim(op.get_bind()) == 768:
+        return
+
+    # Session-scoped build tuning: HNSW graph insertion slows by an order of
+    # magnitude once the graph spills out of maintenance_work_mem, and btree
+    # builds parallelize. These revert when the migration session ends.
+    op.execute("SET maintenance_work_mem = '2GB'")
+    op.execute("SET max_parallel_maintenance_workers = 7")
+    op.execute("SET max_parallel_workers = 8")
+
+    # Drop the existing HNSW index without blocking readers
+    with op.get_context().autocommit_block():
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS ix_chunks_embedding_hnsw')
     
     # Drop all existing chunks (can't convert dimensions)
     op.execute('TRUNCATE TABLE chunks')
@@ -33,13 +57,25 @@ def upgrade() -> None:
     # Change embedding column to 768 dimensions (Gemini)
     op.execute('ALTER TABLE chunks ALTER COLUMN embedding TYPE vector(768)')
     
-    # Recreate HNSW index with new dimension
-    op.execute("""
-        CREATE INDEX ix_chunks_embedding_hnsw 
-        ON chunks 
-        USING hnsw (embedding vector_cosine_ops)
-        WITH (m = 16, ef_construction = 64)
-    """)
+    # Recreate HNSW index with new dimension. CONCURRENTLY avoids holding an
+    # ACCESS EXCLUSIVE lock on chunks for the full build, so ingestion can
+    # continue; it cannot run inside a transaction, hence the autocommit block.
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE INDEX CONCURRENTLY ix_chunks_embedding_hnsw
+            ON chunks
+            USING hnsw (embedding vector_cosine_ops)
+            WITH (m = 16, ef_construction = 64)
+        """)
+
+    # Reclaim space from the table rewrite and refresh planner statistics so
+    # the first queries after migration use the new index. VACUUM cannot run
+    # inside a transaction, hence the autocommit block.
+    with op.get_context().autocommit_block():
+        op.execute('VACUUM (FULL, ANALYZE) chunks')
+
+    # Keep planner stats fresh across frequent re-embedding runs
+    op.execute('ALTER TABLE chunks SET (autovacuum_analyze_scale_factor = 0.02)')
 
 
 def downgrade() -> None:
@@ -48,8 +84,9 @@ def downgrade() -> None:
     
     Note: This will delete existing chunks.
     """
-    # Drop the HNSW index
-    op.execute('DROP INDEX IF EXISTS ix_chunks_embedding_hnsw')
+    # Drop the HNSW index without blocking readers
+    with op.get_context().autocommit_block():
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS ix_chunks_embedding_hnsw')
     
     # Drop all existing chunks
     op.execute('TRUNCATE TABLE chunks')
@@ -57,11 +94,12 @@ def downgrade() -> None:
     # Change embedding column back to 1536 dimensions
     op.execute('ALTER TABLE chunks ALTER COLUMN embedding TYPE vector(1536)')
     
-    # Recreate HNSW index
-    op.execute("""
-        CREATE INDEX ix_chunks_embedding_hnsw 
-        ON chunks 
-        USING hnsw (embedding vector_cosine_ops)
-        WITH (m = 16, ef_construction = 64)
-    """)
+    # Recreate HNSW index without a long write lock
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE INDEX CONCURRENTLY ix_chunks_embedding_hnsw
+            ON chunks
+            USING hnsw (embedding vector_cosine_ops)
+            WITH (m = 16, ef_construction = 64)
+        """)
 
@@ -19,10 +19,21 @@ depends_on: Union[str, Sequence[str], None] = None
 
 
 def upgrade() -> None:
-    """Create all tables and extensions."""
+    """Create all tables and extensions.
+
+    Index builds assume ~2GB of maintenance_work_mem is available.
+    """
     
     # Enable pgvector extension
     op.execute('CREATE EXTENSION IF NOT EXISTS vector')
+
+    # Session-scoped build tuning: HNSW graph insertion slows by an order of
+    # magnitude once the graph spills out of maintenance_work_mem, and btree
+    # builds parallelize. These revert when the migration session ends.
+    op.execute("SET maintenance_work_mem = '2GB'")
+    op.execute("SET max_parallel_maintenance_workers = 7")
+    op.execute("SET max_parallel_workers = 8")
+
     
     # Create users table
     op.create_table(
@@ -37,8 +48,9 @@ def upgrade() -> None:
         sa.Column('updated_at', sa.DateTime(), nullable=True, server_default=sa.text('now()')),
         sa.PrimaryKeyConstraint('id')
     )
-    op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
-    op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
+    with op.get_context().autocommit_block():
+        op.execute('CREATE INDEX CONCURRENTLY ix_users_id ON users (id)')
+        op.execute('CREATE UNIQUE INDEX CONCURRENTLY ix_users_email ON users (email)')
     
     # Create tenants table
     op.create_table(
@@ -50,8 +62,9 @@ def upgrade() -> None:
         sa.Column('updated_at', sa.DateTime(), nullable=True, server_default=sa.text('now()')),
         sa.PrimaryKeyConstraint('id')
     )
-    op.create_index(op.f('ix_tenants_id'), 'tenants', ['id'], unique=False)
-    op.create_index(op.f('ix_tenants_slug'), 'tenants', ['slug'], unique=True)
+    with op.get_context().autocommit_block():
+        op.execute('CREATE INDEX CONCURRENTLY ix_tenants_id ON tenants (id)')
+        op.execute('CREATE UNIQUE INDEX CONCURRENTLY ix_tenants_slug ON tenants (slug)')
     
     # Create user_tenants junction table
     op.create_table(
@@ -66,11 +79,12 @@ def upgrade() -> None:
         sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
         sa.PrimaryKeyConstraint('id')
     )
-    op.create_index(op.f('ix_user_tenants_id'), 'user_tenants', ['id'], unique=False)
-    op.create_index(op.f('ix_user_tenants_user_id'), 'user_tenants', ['user_id'], unique=False)
-    op.create_index(op.f('ix_user_tenants_tenant_id'), 'user_tenants', ['tenant_id'], unique=False)
-    # Unique constraint to ensure one role per user per tenant
-    op.create_index('ix_user_tenant_unique', 'user_tenants', ['user_id', 'tenant_id'], unique=True)
+    with op.get_context().autocommit_block():
+        op.execute('CREATE INDEX CONCURRENTLY ix_user_tenants_id ON user_tenants (id)')
+        op.execute('CREATE INDEX CONCURRENTLY ix_user_tenants_user_id ON user_tenants (user_id)')
+        op.execute('CREATE INDEX CONCURRENTLY ix_user_tenants_tenant_id ON user_tenants (tenant_id)')
+        # Unique constraint to ensure one role per user per tenant
+        op.execute('CREATE UNIQUE INDEX CONCURRENTLY ix_user_tenant_unique ON user_tenants (user_id, tenant_id)')
     
     # Create documents table
     op.create_table(
@@ -92,11 +106,12 @@ def upgrade() -> None:
         sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
         sa.PrimaryKeyConstraint('id')
     )
-    op.create_index(op.f('ix_documents_id'), 'documents', ['id'], unique=False)
-    op.create_index(op.f('ix_documents_tenant_id'), 'documents', ['tenant_id'], unique=False)
-    op.create_index(op.f('ix_documents_user_id'), 'documents', ['user_id'], unique=False)
-    op.create_index(op.f('ix_documents_status'), 'documents', ['status'], unique=False)
-    op.create_index(op.f('ix_documents_storage_key'), 'documents', ['storage_key'], unique=True)
+    with op.get_context().autocommit_block():
+        op.execute('CREATE INDEX CONCURRENTLY ix_documents_id ON documents (id)')
+        op.execute('CREATE INDEX CONCURRENTLY ix_documents_tenant_id ON documents (tenant_id)')
+        op.execute('CREATE INDEX CONCURRENTLY ix_documents_user_id ON documents (user_id)')
+        op.execute('CREATE INDEX CONCURRENTLY ix_documents_status ON documents (status)')
+        op.execute('CREATE UNIQUE INDEX CONCURRENTLY ix_documents_storage_key ON documents (storage_key)')
     
     # Create chunks table with vector embeddings
     op.create_table(
@@ -110,20 +125,14 @@ def upgrade() -> None:
         sa.ForeignKeyConstraint(['document_id'], ['documents.id'], ondelete='CASCADE'),
         sa.PrimaryKeyConstraint('id')
     )
-    op.create_index(op.f('ix_chunks_id'), 'chunks', ['id'], unique=False)
-    op.create_index(op.f('ix_chunks_document_id'), 'chunks', ['document_id'], unique=False)
+    with op.get_context().autocommit_block():
+        op.execute('CREATE INDEX CONCURRENTLY ix_chunks_id ON chunks (id)')
+        op.execute('CREATE INDEX CONCURRENTLY ix_chunks_document_id ON chunks (document_id)')
     
-    # Cast embedding column to vector type for pgvector
-    op.execute('ALTER TABLE chunks ALTER COLUMN embedding TYPE vector(1536) USING embedding::vector(1536)')
-    
-    # Create vector index for similarity search (using HNSW for better performance)
-    # HNSW is better for most use cases, but you can use IVFFlat for larger datasets
-    op.execute("""
-        CREATE INDEX ix_chunks_embedding_hnsw 
-        ON chunks 
-        USING hnsw (embedding vector_cosine_ops)
-        WITH (m = 16, ef_construction = 64)
-    """)
+    # Cast embedding column to vector type for pgvector.
+    # Created at 768 dims (all-mpnet-base-v2) directly so fresh installs
+    # skip the 1536->768->384->768 rewrite chain in migrations 002-004.
+    op.execute('ALTER TABLE chunks ALTER COLUMN embedding TYPE vector(768) USING embedding::vector(768)')
     
     # Create evaluation_runs table
     op.create_table(
@@ -144,10 +153,21 @@ def upgrade() -> None:
         sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
         sa.PrimaryKeyConstraint('id')
     )
-    op.create_index(op.f('ix_evaluation_runs_id'), 'evaluation_runs', ['id'], unique=False)
-    op.create_index(op.f('ix_evaluation_runs_tenant_id'), 'evaluation_runs', ['tenant_id'], unique=False)
-    op.create_index(op.f('ix_evaluation_runs_user_id'), 'evaluation_runs', ['user_id'], unique=False)
-    op.create_index(op.f('ix_evaluation_runs_created_at'), 'evaluation_runs', ['created_at'], unique=False)
+    with op.get_context().autocommit_block():
+        op.execute('CREATE INDEX CONCURRENTLY ix_evaluation_runs_id ON evaluation_runs (id)')
+        op.execute('CREATE INDEX CONCURRENTLY ix_evaluation_runs_tenant_id ON evaluation_runs (tenant_id)')
+        op.execute('CREATE INDEX CONCURRENTLY ix_evaluation_runs_user_id ON evaluation_runs (user_id)')
+        op.execute('CREATE INDEX CONCURRENTLY ix_evaluation_runs_created_at ON evaluation_runs (created_at)')
+
+    # Vector index for similarity search. HNSW is the heaviest build, so it
+    # runs last when the cache is warm; CONCURRENTLY keeps chunks writable.
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE INDEX CONCURRENTLY ix_chunks_embedding_hnsw
+            ON chunks
+            USING hnsw (embedding vector_cosine_ops)
+            WITH (m = 24, ef_construction = 128)
+        """)
 
 
 def downgrade() -> None:
@@ -0,0 +1,67 @@
+"""Replace single-column FK indexes with tenant-leading composites
+
+Revision ID: 20241211_composite_idx
+Revises: 20241210_doc_covering
+Create Date: 2024-12-11 09:00:00.000000
+
+Every multi-tenant query filters on tenant_id first, so isolated indexes on
+documents.user_id / documents.status and evaluation_runs.user_id are rarely
+chosen by the planner and only add write amplification. Composites that lead
+with tenant_id cover more query shapes with fewer indexes.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '20241211_composite_idx'
+down_revision: Union[str, None] = '20241210_doc_covering'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Swap single-column indexes for tenant-leading composites."""
+    with op.get_context().autocommit_block():
+        # documents: (tenant_id, user_id) covers per-user listings within a tenant
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_documents_tenant_user
+            ON documents (tenant_id, user_id)
+        """)
+        # Partial composite: the ingestion queue only cares about in-flight rows
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_documents_tenant_status
+            ON documents (tenant_id, status)
+            WHERE status IN ('PENDING', 'PROCESSING')
+        """)
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS ix_documents_user_id')
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS ix_documents_status')
+
+        # evaluation_runs: dashboards list runs per tenant by recency
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_evaluation_runs_tenant_created
+            ON evaluation_runs (tenant_id, created_at DESC)
+        """)
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS ix_evaluation_runs_user_id')
+
+
+def downgrade() -> None:
+    """Restore the original single-column indexes."""
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_evaluation_runs_user_id
+            ON evaluation_runs (user_id)
+        """)
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS ix_evaluation_runs_tenant_created')
+
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_documents_status
+            ON documents (status)
+        """)
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_documents_user_id
+            ON documents (user_id)
+        """)
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS ix_documents_tenant_status')
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS ix_documents_tenant_user')
@@ -0,0 +1,106 @@
+"""Partition chunks by hash(document_id)
+
+Revision ID: 20241212_partition_chunks
+Revises: 20241211_composite_idx
+Create Date: 2024-12-12 09:00:00.000000
+
+At 1M+ chunks a single HNSW graph no longer fits in maintenance_work_mem and
+builds take hours. Eight hash partitions on document_id give per-partition
+HNSW graphs that each fit in memory, build independently, and let the planner
+prune partitions for document-scoped queries.
+
+The data copy runs in id-range batches (no OFFSET scans), and the swap is a
+pair of cheap renames at the end.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '20241212_partition_chunks'
+down_revision: Union[str, None] = '20241211_composite_idx'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PARTITIONS = 8
+COPY_BATCH_SIZE = 50_000
+
+
+def upgrade() -> None:
+    """Rebuild chunks as a hash-partitioned table and swap it in."""
+    conn = op.get_bind()
+
+    op.execute("SET maintenance_work_mem = '2GB'")
+    op.execute('SET max_parallel_maintenance_workers = 7')
+
+    # New partitioned table; the partition key must be part of the primary key
+    op.execute("""
+        CREATE TABLE chunks_new (
+            LIKE chunks INCLUDING DEFAULTS
+        ) PARTITION BY HASH (document_id)
+    """)
+    op.execute('ALTER TABLE chunks_new ADD PRIMARY KEY (id, document_id)')
+    op.execute("""
+        ALTER TABLE chunks_new
+        ADD FOREIGN KEY (document_id) REFERENCES documents(id) ON DELETE CASCADE
+    """)
+    for i in range(PARTITIONS):
+        op.execute(f"""
+            CREATE TABLE chunks_p{i} PARTITION OF chunks_new
+            FOR VALUES WITH (MODULUS {PARTITIONS}, REMAINDER {i})
+        """)
+
+    # Copy data in id-range batches so no single transaction holds the whole
+    # table and progress is restartable
+    bounds = conn.execute(sa.text('SELECT min(id), max(id) FROM chunks')).one()
+    if bounds[0] is not None:
+        lo = bounds[0]
+        while lo <= bounds[1]:
+            hi = lo + COPY_BATCH_SIZE - 1
+            conn.execute(
+                sa.text('INSERT INTO chunks_new SELECT * FROM chunks WHERE id BETWEEN :lo AND :hi'),
+                {'lo': lo, 'hi': hi},
+            )
+            lo = hi + 1
+
+    # Indexes on the parent cascade to every partition, so each partition gets
+    # its own (memory-sized) HNSW graph
+    op.execute('CREATE INDEX ix_chunks_document_id ON chunks_new (document_id)')
+    op.execute("""
+        CREATE INDEX ix_chunks_embedding_hnsw
+        ON chunks_new
+        USING hnsw (embedding halfvec_cosine_ops)
+        WITH (m = 24, ef_construction = 128)
+    """)
+
+    # Keep the id sequence alive across the old table's drop, then swap
+    op.execute('ALTER SEQUENCE IF EXISTS chunks_id_seq OWNED BY NONE')
+    op.execute('DROP TABLE chunks')
+    op.execute('ALTER TABLE chunks_new RENAME TO chunks')
+    op.execute('ALTER SEQUENCE IF EXISTS chunks_id_seq OWNED BY chunks.id')
+
+
+def downgrade() -> None:
+    """Collapse the partitions back into a plain table."""
+    op.execute("SET maintenance_work_mem = '2GB'")
+    op.execute('SET max_parallel_maintenance_workers = 7')
+
+    op.execute('CREATE TABLE chunks_plain (LIKE chunks INCLUDING DEFAULTS)')
+    op.execute('ALTER TABLE chunks_plain ADD PRIMARY KEY (id)')
+    op.execute("""
+        ALTER TABLE chunks_plain
+        ADD FOREIGN KEY (document_id) REFERENCES documents(id) ON DELETE CASCADE
+    """)
+    op.execute('INSERT INTO chunks_plain SELECT * FROM chunks')
+    op.execute('CREATE INDEX ix_chunks_document_id ON chunks_plain (document_id)')
+    op.execute("""
+        CREATE INDEX ix_chunks_embedding_hnsw
+        ON chunks_plain
+        USING hnsw (embedding halfvec_cosine_ops)
+        WITH (m = 24, ef_construction = 128)
+    """)
+    op.execute('ALTER SEQUENCE IF EXISTS chunks_id_seq OWNED BY NONE')
+    op.execute('DROP TABLE chunks')
+    op.execute('ALTER TABLE chunks_plain RENAME TO chunks')
+    op.execute('ALTER SEQUENCE IF EXISTS chunks_id_seq OWNED BY chunks.id')
@@ -0,0 +1,56 @@
+"""Convert JSON metadata columns to JSONB with GIN indexes
+
+Revision ID: 20241213_jsonb
+Revises: 20241212_partition_chunks
+Create Date: 2024-12-13 09:00:00.000000
+
+postgresql.JSON stores raw text — every read re-parses and every key lookup
+scans the full value. JSONB parses once at write time, TOAST-compresses
+20-40% smaller, and supports GIN indexes so containment queries like
+doc_metadata @> '{"source": "slack"}' become O(log n).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '20241213_jsonb'
+down_revision: Union[str, None] = '20241212_partition_chunks'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+JSON_COLUMNS = [
+    ('documents', 'doc_metadata'),
+    ('chunks', 'chunk_metadata'),
+    ('evaluation_runs', 'sources'),
+    ('evaluation_runs', 'eval_metadata'),
+]
+
+
+def upgrade() -> None:
+    """Rewrite JSON columns as JSONB and index the hot metadata lookups."""
+    for table, column in JSON_COLUMNS:
+        op.execute(f'ALTER TABLE {table} ALTER COLUMN {column} TYPE jsonb USING {column}::jsonb')
+
+    # jsonb_path_ops GIN: smaller than the default opclass, supports @>
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_documents_doc_metadata_gin
+            ON documents USING gin (doc_metadata jsonb_path_ops)
+        """)
+    # chunks is partitioned — indexes on the parent cascade to partitions but
+    # cannot be built CONCURRENTLY
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_chunks_chunk_metadata_gin
+        ON chunks USING gin (chunk_metadata jsonb_path_ops)
+    """)
+
+
+def downgrade() -> None:
+    """Revert to text-based JSON columns."""
+    op.execute('DROP INDEX IF EXISTS idx_chunks_chunk_metadata_gin')
+    with op.get_context().autocommit_block():
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS idx_documents_doc_metadata_gin')
+    for table, column in JSON_COLUMNS:
+        op.execute(f'ALTER TABLE {table} ALTER COLUMN {column} TYPE json USING {column}::json')
@@ -0,0 +1,37 @@
+"""Placeholder for the optional IVFFlat index (built out-of-band)
+
+Revision ID: 20241214_ivfflat
+Revises: 20241213_jsonb
+Create Date: 2024-12-14 09:00:00.000000
+
+At >1M vectors IVFFlat builds ~30x faster than HNSW at lower QPS — a better
+fit for bulk/analytical scans (e.g. report generation) that don't need
+sub-10ms latency. Maintaining both lets the planner choose per query; bulk
+paths steer it with transaction-local ivfflat.probes.
+
+The index itself is NOT created here: it is opt-in via
+settings.ENABLE_IVFFLAT_INDEX, and migration history must not depend on
+runtime settings (a gated body would stamp the revision as applied while
+creating nothing, making the index unbuildable by alembic later). Run
+scripts/build_ivfflat_index.py to build it; this revision only reserves
+the slot in the chain and drops the index on downgrade.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '20241214_ivfflat'
+down_revision: Union[str, None] = '20241213_jsonb'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """No-op: see scripts/build_ivfflat_index.py."""
+
+
+def downgrade() -> None:
+    """Drop the IVFFlat index if the ops script built one."""
+    op.execute('DROP INDEX IF EXISTS ix_chunks_embedding_ivfflat')
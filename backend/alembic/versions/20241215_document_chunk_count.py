@@ -0,0 +1,77 @@
+"""Denormalize per-document chunk counts onto documents
+
+Revision ID: 20241215_chunk_count
+Revises: 20241214_ivfflat
+Create Date: 2024-12-15 09:00:00.000000
+
+COUNT(*) over chunks per document is O(chunks) unless the visibility map is
+perfectly fresh. A trigger-maintained documents.chunk_count makes the read
+an O(1) primary-key lookup.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '20241215_chunk_count'
+down_revision: Union[str, None] = '20241214_ivfflat'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 30_000
+
+
+def upgrade() -> None:
+    """Add the column, the maintaining trigger, and backfill in batches."""
+    op.add_column(
+        'documents',
+        sa.Column('chunk_count', sa.Integer(), nullable=False, server_default='0'),
+    )
+
+    op.execute("""
+        CREATE FUNCTION bump_chunk_count() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                UPDATE documents SET chunk_count = chunk_count + 1
+                WHERE id = NEW.document_id;
+                RETURN NEW;
+            ELSIF TG_OP = 'DELETE' THEN
+                UPDATE documents SET chunk_count = chunk_count - 1
+                WHERE id = OLD.document_id;
+                RETURN OLD;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_chunks_count
+        AFTER INSERT OR DELETE ON chunks
+        FOR EACH ROW EXECUTE FUNCTION bump_chunk_count()
+    """)
+
+    # Backfill in id-range batches so no single statement locks the whole
+    # documents table
+    conn = op.get_bind()
+    bounds = conn.execute(sa.text('SELECT min(id), max(id) FROM documents')).one()
+    if bounds[0] is not None:
+        lo = bounds[0]
+        while lo <= bounds[1]:
+            hi = lo + BACKFILL_BATCH_SIZE - 1
+            conn.execute(
+                sa.text("""
+                    UPDATE documents d
+                    SET chunk_count = (SELECT count(*) FROM chunks c WHERE c.document_id = d.id)
+                    WHERE d.id BETWEEN :lo AND :hi
+                """),
+                {'lo': lo, 'hi': hi},
+            )
+            lo = hi + 1
+
+
+def downgrade() -> None:
+    """Drop the trigger, function, and column."""
+    op.execute('DROP TRIGGER IF EXISTS trg_chunks_count ON chunks')
+    op.execute('DROP FUNCTION IF EXISTS bump_chunk_count()')
+    op.drop_column('documents', 'chunk_count')
@@ -0,0 +1,37 @@
+"""Widen chunks.id and evaluation_runs.id to bigint
+
+Revision ID: 20241218_bigint_ids
+Revises: 20241217_pgcrypto
+Create Date: 2024-12-18 09:00:00.000000
+
+chunks and evaluation_runs are the two append-heavy tables; INT4 exhausts at
+~2.1B rows and the emergency fix is a full table rewrite under lock. Widening
+now — while both tables are small or freshly truncated — is effectively free.
+Neither id is referenced by a foreign key.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '20241218_bigint_ids'
+down_revision: Union[str, None] = '20241217_pgcrypto'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Widen the id columns and their sequences to bigint."""
+    op.execute('ALTER TABLE chunks ALTER COLUMN id TYPE bigint')
+    op.execute('ALTER SEQUENCE IF EXISTS chunks_id_seq AS bigint')
+    op.execute('ALTER TABLE evaluation_runs ALTER COLUMN id TYPE bigint')
+    op.execute('ALTER SEQUENCE IF EXISTS evaluation_runs_id_seq AS bigint')
+
+
+def downgrade() -> None:
+    """Narrow the id columns back to integer (fails if values exceed INT4)."""
+    op.execute('ALTER SEQUENCE IF EXISTS evaluation_runs_id_seq AS integer')
+    op.execute('ALTER TABLE evaluation_runs ALTER COLUMN id TYPE integer')
+    op.execute('ALTER SEQUENCE IF EXISTS chunks_id_seq AS integer')
+    op.execute('ALTER TABLE chunks ALTER COLUMN id TYPE integer')
@@ -0,0 +1,39 @@
+"""Add documents.content_hash for upload deduplication
+
+Revision ID: 20241219_content_hash
+Revises: 20241218_bigint_ids
+Create Date: 2024-12-19 09:00:00.000000
+
+Re-uploading an identical file (common with Drive syncs) re-runs the whole
+embedding pipeline. Storing a sha256 of the upload bytes lets the upload
+endpoint short-circuit to the existing row. Nullable because rows ingested
+before this migration have no hash; the partial index keeps those rows out
+of the lookup path.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '20241219_content_hash'
+down_revision: Union[str, None] = '20241218_bigint_ids'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add the content_hash column and its tenant-scoped lookup index."""
+    op.add_column('documents', sa.Column('content_hash', sa.String(length=64), nullable=True))
+    op.create_index(
+        'ix_documents_tenant_content_hash',
+        'documents',
+        ['tenant_id', 'content_hash'],
+        postgresql_where=sa.text('content_hash IS NOT NULL'),
+    )
+
+
+def downgrade() -> None:
+    """Drop the dedup column and index."""
+    op.drop_index('ix_documents_tenant_content_hash', table_name='documents')
+    op.drop_column('documents', 'content_hash')
@@ -0,0 +1,73 @@
+"""Convert native enum columns to CHECK-constrained varchar
+
+Revision ID: 20241221_varchar_enums
+Revises: 20241220_ut_covering
+Create Date: 2024-12-21 09:00:00.000000
+
+documents.status and user_tenants.role were native Postgres ENUM types.
+Every plan touching them pays a pg_type/pg_enum catalog lookup, and
+adding a value needs ALTER TYPE (which can't run inside a transaction
+on older Postgres). A varchar with a CHECK constraint behaves
+identically for equality filters and the partial/covering indexes we
+already have, and evolving the value set becomes a cheap constraint
+swap. Stored values are the Python enum names, which the cast to text
+preserves as-is.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '20241221_varchar_enums'
+down_revision: Union[str, None] = '20241220_ut_covering'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_STATUS_VALUES = ('PENDING', 'PROCESSING', 'COMPLETED', 'FAILED')
+_ROLE_VALUES = ('OWNER', 'ADMIN', 'MEMBER', 'VIEWER')
+
+
+def upgrade() -> None:
+    """Swap native enum columns for varchar + CHECK and drop the pg types."""
+    op.execute("""
+        ALTER TABLE documents
+        ALTER COLUMN status TYPE varchar(16) USING status::text
+    """)
+    op.execute(f"""
+        ALTER TABLE documents
+        ADD CONSTRAINT ck_documents_status
+        CHECK (status IN {_STATUS_VALUES!r})
+    """)
+
+    op.execute("""
+        ALTER TABLE user_tenants
+        ALTER COLUMN role TYPE varchar(16) USING role::text
+    """)
+    op.execute(f"""
+        ALTER TABLE user_tenants
+        ADD CONSTRAINT ck_user_tenants_role
+        CHECK (role IN {_ROLE_VALUES!r})
+    """)
+
+    # No columns reference the enum types any more
+    op.execute('DROP TYPE IF EXISTS documentstatus')
+    op.execute('DROP TYPE IF EXISTS roleenum')
+
+
+def downgrade() -> None:
+    """Recreate the native enum types and cast the columns back."""
+    op.execute(f"CREATE TYPE documentstatus AS ENUM {_STATUS_VALUES!r}")
+    op.execute(f"CREATE TYPE roleenum AS ENUM {_ROLE_VALUES!r}")
+
+    op.execute('ALTER TABLE documents DROP CONSTRAINT IF EXISTS ck_documents_status')
+    op.execute("""
+        ALTER TABLE documents
+        ALTER COLUMN status TYPE documentstatus USING status::documentstatus
+    """)
+
+    op.execute('ALTER TABLE user_tenants DROP CONSTRAINT IF EXISTS ck_user_tenants_role')
+    op.execute("""
+        ALTER TABLE user_tenants
+        ALTER COLUMN role TYPE roleenum USING role::roleenum
+    """)
@@ -1,14 +1,26 @@
 """Agent action endpoints (email, Jira, reports)."""
 
+import asyncio
+import gzip
+import hashlib
 import json
-import uuid
+import re
+import secrets
+import time
+from functools import lru_cache
+
+import aiofiles
+import jinja2
+import markdown as _markdown
 from datetime import datetime
 from pathlib import Path
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import FileResponse
+from typing import AsyncIterator
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
+from email_validator import validate_email, EmailNotValidError
 
 from app.core.database import get_db
 from app.core.security import get_current_user, require_tenant_access
@@ -16,18 +28,109 @@ from app.core.config import settings
 from app.core.logging import get_logger
 from app.models.document import Document, Chunk
 from app.services.agent import AgentService
-from app.services.retriever import RetrieverService
 from app.services.storage import storage_service
 from app.services.credentials import credentials_service
-from app.integrations.jira_client import JiraClient
+from app.services.report_batcher import report_batcher
+from app.integrations.jira_client import get_jira_client
 from app.integrations.email_client import EmailClient
 
 logger = get_logger(__name__)
-router = APIRouter()
+# orjson serializes JSON responses several times faster than the default
+# pure-Python encoder
+router = APIRouter(default_response_class=ORJSONResponse)
 
-# Initialize services
-agent_service = AgentService()
-retriever_service = RetrieverService()
+
+@lru_cache(maxsize=1)
+def get_agent_service() -> AgentService:
+    """Lazily construct the shared AgentService on first use.
+
+    Building it at import time would pay LLM-client construction on every
+    worker boot, including workers that never serve these endpoints.
+    """
+    return AgentService()
+
+# Recent drafts keyed by hash(context, tone, recipient) so idempotent retries
+# skip the LLM call entirely. Each cache clears wholesale when it hits its
+# entry cap (same policy as security's token cache) — TTLs alone never evict
+# missed keys, so an unbounded dict would grow for the process lifetime.
+_draft_cache: dict[int, tuple[float, dict]] = {}
+_DRAFT_CACHE_TTL_SECONDS = 300
+_DRAFT_CACHE_MAX_ENTRIES = 1_000
+
+# Bound concurrent per-document summarization calls in generate_report
+_REPORT_MAP_CONCURRENCY = 8
+
+# Max characters of chunk content fed to the per-document summary prompt
+_DOC_CONTEXT_BUDGET = 10000
+
+# Finished reports keyed by content fingerprint: regenerating the same report
+# over unchanged documents skips the LLM calls entirely and reuses the file
+# already on disk
+_report_cache: dict[str, tuple[float, dict]] = {}
+_REPORT_CACHE_TTL_SECONDS = 86400
+_REPORT_CACHE_MAX_ENTRIES = 1_000
+
+# Report ids are hex tokens from secrets.token_hex; reject anything else
+# before touching the filesystem (8-char ids predate the longer tokens)
+_REPORT_ID_RE = re.compile(r"^[0-9a-f]{8,16}$")
+
+# Gzipped report bytes keyed by (tenant_id, report_id): reports are small,
+# immutable once written, and highly compressible, so popular ones are served
+# from memory instead of re-reading the file per request
+_report_bytes_cache: dict[tuple[int, str], tuple[float, bytes, str]] = {}
+_REPORT_BYTES_CACHE_TTL_SECONDS = 300
+# Whole gzipped reports live in each entry, so cap this one lower
+_REPORT_BYTES_CACHE_MAX_ENTRIES = 256
+
+# Stable system prompts for report generation. Keep these byte-for-byte
+# identical across calls — vendor-side prompt caching discounts a repeated
+# prefix, so all volatile fields (filenames, content) go in the HumanMessage.
+_SUMMARY_SYSTEM_PROMPT = """You are an expert analyst. Summarize documents accurately and concisely.
+
+Capture the main findings, important details, and anything actionable. Respond in concise markdown bullet points."""
+
+_REPORT_SYSTEM_PROMPT = """You are an expert report writer. Generate professional, well-structured reports.
+
+Create a well-structured report with:
+- Executive summary
+- Key findings
+- Detailed analysis
+- Conclusions and recommendations
+
+Format the report in markdown with proper headings, sections, and formatting."""
+
+# Compiled once at import: only the dynamic slots are substituted per report,
+# instead of rebuilding the whole shell (CSS included) via f-string each call.
+# The body is pre-rendered HTML, hence the |safe; the other slots are escaped.
+_REPORT_TEMPLATE = jinja2.Template(
+    """<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <title>Document Report</title>
+    <style>
+        body { font-family: Arial, sans-serif; max-width: 800px; margin: 40px auto; padding: 20px; line-height: 1.6; }
+        h1 { color: #333; border-bottom: 2px solid #333; padding-bottom: 10px; }
+        h2 { color: #555; margin-top: 30px; }
+        h3 { color: #777; }
+        p { margin: 15px 0; }
+        ul, ol { margin: 15px 0; padding-left: 30px; }
+        code { background: #f4f4f4; padding: 2px 6px; border-radius: 3px; }
+        pre { background: #f4f4f4; padding: 15px; border-radius: 5px; overflow-x: auto; }
+        blockquote { border-left: 4px solid #ddd; padding-left: 20px; margin: 20px 0; color: #666; }
+    </style>
+</head>
+<body>
+    <h1>Document Analysis Report</h1>
+    <p><strong>Generated:</strong> {{ generated_at }}</p>
+    <p><strong>Documents:</strong> {{ documents }}</p>
+    <hr>
+    {{ body | safe }}
+</body>
+</html>
+""",
+    autoescape=True,
+)
 
 
 class EmailDraftRequest(BaseModel):
@@ -55,6 +158,24 @@ class SendEmailRequest(BaseModel):
     cc_emails: list[str] | None = None
     bcc_emails: list[str] | None = None
 
+    @field_validator("to_emails", "cc_emails", "bcc_emails")
+    @classmethod
+    def validate_recipients(cls, v: list[str] | None) -> list[str] | None:
+        """Validate and normalize addresses before any SMTP work.
+
+        A bad address would otherwise only fail inside the SMTP DATA
+        exchange, after the handshake — and poison a pooled connection.
+        """
+        if v is None:
+            return v
+        normalized = []
+        for addr in v:
+            try:
+                normalized.append(validate_email(addr, check_deliverability=False).normalized)
+            except EmailNotValidError as e:
+                raise ValueError(f"Invalid email address {addr!r}: {e}")
+        return normalized
+
 
 class SendEmailResponse(BaseModel):
     """Email sending response."""
@@ -103,6 +224,7 @@ async def generate_email_draft(
     request: EmailDraftRequest,
     current_user: dict = Depends(require_tenant_access),
     db: AsyncSession = Depends(get_db),
+    agent_service: AgentService = Depends(get_agent_service),
 ):
     """
     Generate an email draft using AI.
@@ -111,20 +233,29 @@ async def generate_email_draft(
     based on the provided context.
     """
     try:
+        # Serve idempotent retries from the short-lived draft cache
+        cache_key = hash((request.context, request.tone, request.recipient))
+        cached = _draft_cache.get(cache_key)
+        if cached and time.time() - cached[0] < _DRAFT_CACHE_TTL_SECONDS:
+            return cached[1]
+
         result = await agent_service.generate_email_draft(
             context=request.context,
             recipient=request.recipient,
             tone=request.tone,
         )
-        
+        if len(_draft_cache) >= _DRAFT_CACHE_MAX_ENTRIES:
+            _draft_cache.clear()
+        _draft_cache[cache_key] = (time.time(), result)
+
         logger.info(
             "email_draft_generated",
             tenant_id=current_user["tenant_id"],
             user_id=current_user["user_id"],
         )
-        
+
         return result
-        
+
     except Exception as e:
         logger.error("email_draft_endpoint_failed", error=str(e))
         raise HTTPException(
@@ -133,6 +264,47 @@ async def generate_email_draft(
         )
 
 
+@router.post("/email-draft-stream")
+async def generate_email_draft_stream(
+    request: EmailDraftRequest,
+    current_user: dict = Depends(require_tenant_access),
+    db: AsyncSession = Depends(get_db),
+    agent_service: AgentService = Depends(get_agent_service),
+):
+    """
+    Generate an email draft with SSE streaming.
+
+    Streams draft tokens as they arrive from the LLM so the client sees
+    first tokens immediately instead of waiting for the full draft.
+    """
+
+    async def generate() -> AsyncIterator[str]:
+        try:
+            async for token in agent_service.generate_email_draft_stream(
+                context=request.context,
+                recipient=request.recipient,
+                tone=request.tone,
+            ):
+                token_data = {"type": "token", "content": token}
+                yield f"data: {json.dumps(token_data)}\n\n"
+
+            yield "data: [DONE]\n\n"
+
+            logger.info(
+                "email_draft_streamed",
+                tenant_id=current_user["tenant_id"],
+                user_id=current_user["user_id"],
+            )
+
+        except Exception as e:
+            logger.error("email_draft_stream_failed", error=str(e))
+            error_data = {"type": "error", "content": f"An error occurred: {str(e)}"}
+            yield f"data: {json.dumps(error_data)}\n\n"
+            yield "data: [DONE]\n\n"
+
+    return StreamingResponse(generate(), media_type="text/event-stream")
+
+
 @router.post("/send-email", response_model=SendEmailResponse)
 async def send_email(
     request: SendEmailRequest,
@@ -186,7 +358,7 @@ async def send_email(
         )
         
         # Send email
-        result = email_client.send_email(
+        result = await email_client.send_email(
             to_emails=request.to_emails,
             subject=request.subject,
             body=request.body,
@@ -254,20 +426,18 @@ async def test_jira_connection(
                 "message": "Jira credentials not configured. Please configure Jira credentials in tenant settings or set JIRA_URL, JIRA_EMAIL, and JIRA_API_TOKEN in environment variables.",
             }
         
-        # Initialize Jira client
-        jira_client = JiraClient(
+        # Reuse the shared client for these credentials
+        jira_client = get_jira_client(
             server_url=jira_url,
             email=jira_email,
             api_token=jira_api_token,
         )
-        
-        # Test connection
-        is_connected = jira_client.test_connection()
-        
+
+        is_connected = await jira_client.test_connection()
+
         if is_connected:
             # Get current user info
-            client = jira_client._get_client()
-            current_user_info = client.current_user()
+            current_user_info = await jira_client.get_myself()
             
             logger.info(
                 "jira_connection_test_success",
@@ -279,9 +449,9 @@ async def test_jira_connection(
                 "status": "connected",
                 "message": "Successfully connected to Jira",
                 "user": {
-                    "account_id": current_user_info.accountId,
-                    "display_name": current_user_info.displayName,
-                    "email": getattr(current_user_info, "emailAddress", None),
+                    "account_id": current_user_info.get("accountId"),
+                    "display_name": current_user_info.get("displayName"),
+                    "email": current_user_info.get("emailAddress"),
                 },
                 "server_url": settings.JIRA_URL,
             }
@@ -338,15 +508,14 @@ async def create_jira_ticket(
                 detail="Jira credentials not configured. Please configure Jira credentials in tenant settings or set JIRA_URL, JIRA_EMAIL, and JIRA_API_TOKEN in environment variables.",
             )
         
-        # Initialize Jira client
-        jira_client = JiraClient(
+        # Reuse the shared client for these credentials
+        jira_client = get_jira_client(
             server_url=jira_url,
             email=jira_email,
             api_token=jira_api_token,
         )
-        
-        # Create ticket
-        result = jira_client.create_ticket(
+
+        result = await jira_client.create_ticket(
             project_key=request.project_key,
             summary=request.summary,
             description=request.description,
@@ -377,6 +546,7 @@ async def generate_report(
     request: ReportRequest,
     current_user: dict = Depends(require_tenant_access),
     db: AsyncSession = Depends(get_db),
+    agent_service: AgentService = Depends(get_agent_service),
 ):
     """
     Generate a report from selected documents.
@@ -386,109 +556,152 @@ async def generate_report(
     """
     try:
         tenant_id = current_user["tenant_id"]
-        
-        # 1. Validate documents belong to tenant
-        result = await db.execute(
-            select(Document)
+
+        # 1. Validate documents and fetch their chunks in a single round-trip.
+        # The outer join keeps zero-chunk documents visible so tenant/status
+        # validation still sees them. Rows are streamed rather than loaded
+        # with .all(): peak memory stays at one row, and once every requested
+        # document has been seen and filled its prompt budget the cursor is
+        # abandoned without transferring the remaining chunks.
+        expected_ids = set(request.document_ids)
+        doc_filenames: dict[int, str] = {}
+        chunks_by_doc: dict[int, list[str]] = {}
+        doc_context_sizes: dict[int, int] = {}
+
+        result = await db.stream(
+            select(Document.id, Document.filename, Chunk.content)
+            .outerjoin(Chunk, Chunk.document_id == Document.id)
             .where(
                 Document.id.in_(request.document_ids),
                 Document.tenant_id == tenant_id,
                 Document.status == "completed",
             )
+            .order_by(Document.id, Chunk.id)
         )
-        documents = result.scalars().all()
-        
-        if len(documents) != len(request.document_ids):
+        try:
+            async for doc_id, filename, content in result:
+                doc_filenames[doc_id] = filename
+                if content is None:
+                    continue
+                size = doc_context_sizes.get(doc_id, 0)
+                if size >= _DOC_CONTEXT_BUDGET:
+                    if len(doc_filenames) == len(expected_ids) and all(
+                        doc_context_sizes.get(d, 0) >= _DOC_CONTEXT_BUDGET
+                        for d in doc_filenames
+                    ):
+                        break
+                    continue
+                chunks_by_doc.setdefault(doc_id, []).append(content)
+                doc_context_sizes[doc_id] = size + len(content) + 2  # +2 for the join separator
+        finally:
+            await result.close()
+
+        if len(doc_filenames) != len(set(request.document_ids)):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="One or more documents not found or not accessible",
             )
-        
-        # 2. Fetch chunks from documents
-        result = await db.execute(
-            select(Chunk)
-            .where(Chunk.document_id.in_(request.document_ids))
-            .order_by(Chunk.document_id, Chunk.id)
-        )
-        chunks = result.scalars().all()
-        
-        if not chunks:
+
+        if not chunks_by_doc:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="No content found in selected documents",
             )
-        
-        # 3. Build context from chunks
-        context_parts = []
-        for chunk in chunks:
-            context_parts.append(chunk.content)
-        full_context = "\n\n".join(context_parts)
-        
-        # 4. Generate report using LLM
-        report_prompt = f"""Generate a comprehensive {request.report_type} report based on the following document content:
 
-Documents: {', '.join([d.filename for d in documents])}
+        # Extract filenames once; the prompt, HTML header, and response all
+        # reuse the same list so they can't drift apart
+        filenames = list(doc_filenames.values())
+        filenames_csv = ", ".join(filenames)
+
+        # 3. Serve identical regenerations from cache. The key fingerprints
+        # the selected content (per-document context sizes change when a
+        # document is re-ingested), so stale reports are not served.
+        cache_key = hashlib.sha256(
+            json.dumps(
+                {
+                    "tenant_id": tenant_id,
+                    "ids": sorted(request.document_ids),
+                    "type": request.report_type,
+                    "format": request.format,
+                    "sizes": sorted(doc_context_sizes.items()),
+                },
+                sort_keys=True,
+            ).encode()
+        ).hexdigest()
+        cached = _report_cache.get(cache_key)
+        if cached and time.time() - cached[0] < _REPORT_CACHE_TTL_SECONDS:
+            logger.info("report_cache_hit", tenant_id=tenant_id)
+            return cached[1]
+
+        from langchain.schema import HumanMessage, SystemMessage
+
+        llm = agent_service._get_llm()
+        semaphore = asyncio.Semaphore(_REPORT_MAP_CONCURRENCY)
+
+        # 4. Map: summarize each document concurrently (bounded), then reduce
+        # into one report. N serial LLM calls would be O(N) latency; gather
+        # makes the map step roughly as fast as the slowest single document.
+        async def summarize_document(doc_id: int, filename: str) -> str:
+            doc_context = "\n\n".join(chunks_by_doc.get(doc_id, []))[:_DOC_CONTEXT_BUDGET]
+            summary_prompt = f"""Summarize the key points of the following document for inclusion in a {request.report_type} report:
+
+Document: {filename}
 
 Content:
-{full_context[:10000]}  # Limit context size
+{doc_context}"""
+            async with semaphore:
+                response = await llm.ainvoke([
+                    SystemMessage(content=_SUMMARY_SYSTEM_PROMPT),
+                    HumanMessage(content=summary_prompt),
+                ])
+            return response.content
+
+        summaries = await asyncio.gather(
+            *(summarize_document(doc_id, filename) for doc_id, filename in doc_filenames.items())
+        )
 
-Create a well-structured report with:
-- Executive summary
-- Key findings
-- Detailed analysis
-- Conclusions and recommendations
+        summary_sections = "\n\n".join(
+            f"## {filename}\n{summary}"
+            for filename, summary in zip(doc_filenames.values(), summaries)
+        )
 
-Format the report in markdown with proper headings, sections, and formatting.
+        report_prompt = f"""Generate a comprehensive {request.report_type} report based on the following per-document summaries:
+
+Documents: {filenames_csv}
+
+Summaries:
+{summary_sections}
 """
-        
-        from langchain.schema import HumanMessage, SystemMessage
-        
-        llm = agent_service._get_llm()
-        messages = [
-            SystemMessage(content="You are an expert report writer. Generate professional, well-structured reports."),
-            HumanMessage(content=report_prompt),
-        ]
-        
-        response = await llm.ainvoke(messages)
-        report_content = response.content
+
+        if settings.ENABLE_REPORT_BATCHING:
+            report_content = await report_batcher.generate(
+                llm, _REPORT_SYSTEM_PROMPT, report_prompt
+            )
+        else:
+            response = await llm.ainvoke([
+                SystemMessage(content=_REPORT_SYSTEM_PROMPT),
+                HumanMessage(content=report_prompt),
+            ])
+            report_content = response.content
         
         # 5. Generate HTML report
         if request.format == "html":
-            html_content = f"""<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-    <title>Document Report</title>
-    <style>
-        body {{ font-family: Arial, sans-serif; max-width: 800px; margin: 40px auto; padding: 20px; line-height: 1.6; }}
-        h1 {{ color: #333; border-bottom: 2px solid #333; padding-bottom: 10px; }}
-        h2 {{ color: #555; margin-top: 30px; }}
-        h3 {{ color: #777; }}
-        p {{ margin: 15px 0; }}
-        ul, ol {{ margin: 15px 0; padding-left: 30px; }}
-        code {{ background: #f4f4f4; padding: 2px 6px; border-radius: 3px; }}
-        pre {{ background: #f4f4f4; padding: 15px; border-radius: 5px; overflow-x: auto; }}
-        blockquote {{ border-left: 4px solid #ddd; padding-left: 20px; margin: 20px 0; color: #666; }}
-    </style>
-</head>
-<body>
-    <h1>Document Analysis Report</h1>
-    <p><strong>Generated:</strong> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-    <p><strong>Documents:</strong> {', '.join([d.filename for d in documents])}</p>
-    <hr>
-    {_markdown_to_html(report_content)}
-</body>
-</html>
-"""
-            
+            html_content = _REPORT_TEMPLATE.render(
+                generated_at=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                documents=filenames_csv,
+                body=_markdown_to_html(report_content),
+            )
+
+
             # Save HTML report
-            report_id = uuid.uuid4().hex[:8]
+            report_id = secrets.token_hex(8)
             storage_key = f"tenant_{tenant_id}/reports/{report_id}_report.html"
             
-            # Save to local storage
+            # Save to local storage without blocking the event loop on disk I/O
             report_path = storage_service.local_path / storage_key
-            report_path.parent.mkdir(parents=True, exist_ok=True)
-            report_path.write_text(html_content, encoding="utf-8")
+            await asyncio.to_thread(report_path.parent.mkdir, parents=True, exist_ok=True)
+            async with aiofiles.open(report_path, "w", encoding="utf-8") as f:
+                await f.write(html_content)
             
             # Return API endpoint URL for accessing the report
             report_url = f"/api/{settings.API_VERSION}/agent/reports/{report_id}"
@@ -503,18 +716,22 @@ Format the report in markdown with proper headings, sections, and formatting.
             "report_generated",
             report_type=request.report_type,
             format=request.format,
-            document_count=len(documents),
+            document_count=len(doc_filenames),
             tenant_id=tenant_id,
         )
         
-        return {
+        response_payload = {
             "report_url": report_url,
             "format": request.format,
             "report_id": report_id,
             "report_type": request.report_type,
-            "document_names": [d.filename for d in documents],
-            "document_count": len(documents),
+            "document_names": filenames,
+            "document_count": len(filenames),
         }
+        if len(_report_cache) >= _REPORT_CACHE_MAX_ENTRIES:
+            _report_cache.clear()
+        _report_cache[cache_key] = (time.time(), response_payload)
+        return response_payload
         
     except HTTPException:
         raise
@@ -529,42 +746,91 @@ Format the report in markdown with proper headings, sections, and formatting.
 @router.get("/reports/{report_id}")
 async def get_report(
     report_id: str,
+    request: Request,
     current_user: dict = Depends(require_tenant_access),
     db: AsyncSession = Depends(get_db),
 ):
     """
     Serve a generated report file.
-    
-    Validates that the report belongs to the user's tenant.
+
+    Validates that the report belongs to the user's tenant. Reports are
+    gzipped and cached in memory on first read; conditional requests get
+    a 304 via ETag instead of a re-download.
     """
     try:
-        tenant_id = current_user["tenant_id"]
-        
-        # Construct storage key
-        storage_key = f"tenant_{tenant_id}/reports/{report_id}_report.html"
-        report_path = storage_service.local_path / storage_key
-        
-        # Check if file exists
-        if not report_path.exists():
+        # Short-circuit obviously bogus ids before any filesystem work
+        if not _REPORT_ID_RE.fullmatch(report_id):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Report not found",
             )
-        
-        # Verify tenant access (report path contains tenant_id)
-        if f"tenant_{tenant_id}" not in str(report_path):
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Access denied",
-            )
-        
-        # Return file
-        return FileResponse(
-            path=str(report_path),
+
+        tenant_id = current_user["tenant_id"]
+
+        cached = _report_bytes_cache.get((tenant_id, report_id))
+        if cached and time.time() - cached[0] < _REPORT_BYTES_CACHE_TTL_SECONDS:
+            _, gz_bytes, etag = cached
+        else:
+            # Resolve the canonical path and require it to stay inside the
+            # tenant's reports directory; unlike the old substring check this
+            # also blocks path traversal via a crafted report_id
+            tenant_dir = (storage_service.local_path / f"tenant_{tenant_id}" / "reports").resolve()
+            report_path = (tenant_dir / f"{report_id}_report.html").resolve()
+
+            if not report_path.is_relative_to(tenant_dir):
+                raise HTTPException(
+                    status_code=status.HTTP_403_FORBIDDEN,
+                    detail="Access denied",
+                )
+
+            # Check if file exists
+            if not report_path.exists():
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Report not found",
+                )
+
+            async with aiofiles.open(report_path, "rb") as f:
+                data = await f.read()
+            gz_bytes = gzip.compress(data, 6)
+            etag = f'"{hashlib.sha256(data).hexdigest()[:16]}"'
+            if len(_report_bytes_cache) >= _REPORT_BYTES_CACHE_MAX_ENTRIES:
+                _report_bytes_cache.clear()
+            _report_bytes_cache[(tenant_id, report_id)] = (time.time(), gz_bytes, etag)
+
+        # The body varies on Accept-Encoding, so caches must key on it, and
+        # each representation needs its own ETag — the gzip and identity
+        # bodies are different entities and must not validate for each other
+        accepts_gzip = "gzip" in request.headers.get("accept-encoding", "").lower()
+        if accepts_gzip:
+            etag = f'{etag[:-1]}-gzip"'
+
+        headers = {
+            "ETag": etag,
+            "Cache-Control": "private, max-age=300",
+            "Vary": "Accept-Encoding",
+        }
+
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        headers["Content-Disposition"] = f'attachment; filename="report_{report_id}.html"'
+
+        # Only send the compressed body to clients that advertised gzip;
+        # a plain downloader (curl -O, wget) would otherwise save the raw
+        # gzip bytes as the file
+        if accepts_gzip:
+            headers["Content-Encoding"] = "gzip"
+            body = gz_bytes
+        else:
+            body = gzip.decompress(gz_bytes)
+
+        return Response(
+            content=body,
             media_type="text/html",
-            filename=f"report_{report_id}.html",
+            headers=headers,
         )
-        
+
     except HTTPException:
         raise
     except Exception as e:
@@ -575,36 +841,13 @@ async def get_report(
         )
 
 
-def _markdown_to_html(markdown: str) -> str:
-    """Simple markdown to HTML converter (basic implementation)."""
-    import re
-    
-    html = markdown
-    
-    # Headers
-    html = re.sub(r'^### (.*)$', r'<h3>\1</h3>', html, flags=re.MULTILINE)
-    html = re.sub(r'^## (.*)$', r'<h2>\1</h2>', html, flags=re.MULTILINE)
-    html = re.sub(r'^# (.*)$', r'<h1>\1</h1>', html, flags=re.MULTILINE)
-    
-    # Bold
-    html = re.sub(r'\*\*(.*?)\*\*', r'<strong>\1</strong>', html)
-    
-    # Italic
-    html = re.sub(r'\*(.*?)\*', r'<em>\1</em>', html)
-    
-    # Code blocks
-    html = re.sub(r'```([^`]+)```', r'<pre><code>\1</code></pre>', html, flags=re.DOTALL)
-    
-    # Inline code
-    html = re.sub(r'`([^`]+)`', r'<code>\1</code>', html)
-    
-    # Lists
-    html = re.sub(r'^\* (.*)$', r'<li>\1</li>', html, flags=re.MULTILINE)
-    html = re.sub(r'(<li>.*</li>)', r'<ul>\1</ul>', html, flags=re.DOTALL)
-    
-    # Paragraphs
-    paragraphs = html.split('\n\n')
-    html = '\n'.join([f'<p>{p.strip()}</p>' if p.strip() and not p.strip().startswith('<') else p for p in paragraphs])
-    
-    return html
+def _markdown_to_html(text: str) -> str:
+    """Render markdown to HTML with a single parser pass.
+
+    The previous hand-rolled converter ran eight full-buffer regex
+    substitutions per call (with backtracking-prone ``.*?`` patterns);
+    the markdown library tokenizes the report once and handles nested
+    constructs correctly.
+    """
+    return _markdown.markdown(text, extensions=["fenced_code", "tables"])
 
@@ -1,14 +1,18 @@
 """Authentication endpoints."""
 
+import asyncio
+import itertools
 from datetime import datetime
+from typing import Annotated
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from pydantic import BaseModel, EmailStr
+from sqlalchemy import and_, select
+from pydantic import BaseModel, EmailStr, StringConstraints
 
 from app.core.database import get_db
 from app.core.security import (
     hash_password,
+    password_needs_rehash,
     verify_password,
     create_access_token,
     create_refresh_token,
@@ -22,6 +26,25 @@ from app.core.logging import get_logger
 logger = get_logger(__name__)
 router = APIRouter()
 
+# Fixed argon2 hash verified when login finds no eligible user, so "no such
+# account" and "wrong password" take the same time (no user-enumeration
+# timing side channel). Never matches a real password.
+_DUMMY_PASSWORD_HASH = (
+    "$argon2id$v=19$m=65536,t=3,p=4$5RyDsFaK8V4rBSAE4FyLcQ"
+    "$Q90Bsh24dvGTMrG1C2HbiMdNJ+G5sq5nsJjVXDydvvo"
+)
+
+
+# Cheap shape check for the login hot path: pydantic's compiled regex runs
+# in a few µs, vs hundreds of µs for the full RFC parse email_validator does
+# behind EmailStr. Login only needs the string to look up an existing row;
+# the handler mirrors EmailStr's domain lowercasing so the lookup matches
+# what registration stored. Registration keeps full EmailStr validation.
+FastEmail = Annotated[
+    str,
+    StringConstraints(pattern=r"^[^@\s]+@[^@\s]+\.[^@\s]+$", max_length=254),
+]
+
 
 class RegisterRequest(BaseModel):
     """User registration request."""
@@ -35,7 +58,7 @@ class RegisterRequest(BaseModel):
 class LoginRequest(BaseModel):
     """User login request."""
 
-    email: EmailStr
+    email: FastEmail
     password: str
 
 
@@ -76,19 +99,31 @@ async def register(request: RegisterRequest, db: AsyncSession = Depends(get_db))
     - User-tenant relationship with owner role
     """
     try:
-        # 1. Check if user already exists
-        result = await db.execute(select(User).where(User.email == request.email))
-        existing_user = result.scalar_one_or_none()
-        
-        if existing_user:
+        # 1. Start hashing the password in a thread immediately — it's
+        # independent of the duplicate-email check, so its CPU cost (tens
+        # of ms) overlaps with the DB round-trip instead of adding to it
+        hash_task = asyncio.create_task(asyncio.to_thread(hash_password, request.password))
+
+        # 2. Check if user already exists: SELECT 1 instead of materializing
+        # the full User row (including the hashed password) just to test
+        # for existence
+        try:
+            result = await db.execute(
+                select(1).where(User.email == request.email).limit(1)
+            )
+        except Exception:
+            hash_task.cancel()
+            raise
+
+        if result.scalar() is not None:
+            hash_task.cancel()
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email already registered",
             )
-        
-        # 2. Hash password
-        hashed_pwd = hash_password(request.password)
-        
+
+        hashed_pwd = await hash_task
+
         # 3. Create user
         new_user = User(
             email=request.email,
@@ -103,15 +138,20 @@ async def register(request: RegisterRequest, db: AsyncSession = Depends(get_db))
         tenant_name = request.tenant_name or f"{request.email.split('@')[0]}'s Workspace"
         tenant_slug = tenant_name.lower().replace(" ", "-").replace("'", "")
         
-        # Ensure unique slug
+        # Ensure unique slug: fetch all colliding slugs in one query and pick
+        # the first free suffix in Python, instead of one round-trip per
+        # candidate (common workspace names can collide many times)
         slug_base = tenant_slug
-        counter = 1
-        while True:
-            result = await db.execute(select(Tenant).where(Tenant.slug == tenant_slug))
-            if not result.scalar_one_or_none():
-                break
-            tenant_slug = f"{slug_base}-{counter}"
-            counter += 1
+        result = await db.execute(
+            select(Tenant.slug).where(Tenant.slug.like(f"{slug_base}%"))
+        )
+        taken = set(result.scalars())
+        if slug_base in taken:
+            tenant_slug = next(
+                candidate
+                for candidate in (f"{slug_base}-{i}" for i in itertools.count(1))
+                if candidate not in taken
+            )
         
         new_tenant = Tenant(
             name=tenant_name,
@@ -172,47 +212,58 @@ async def login(request: LoginRequest, db: AsyncSession = Depends(get_db)):
     Returns tokens with user info and default tenant context.
     """
     try:
-        # 1. Find user by email
-        result = await db.execute(select(User).where(User.email == request.email))
-        user = result.scalar_one_or_none()
-        
-        if not user:
+        # EmailStr lowercased the domain at registration; mirror that here
+        # so a differently-cased domain still matches the stored row (the
+        # local part stays exactly as registered)
+        local_part, domain = request.email.rsplit("@", 1)
+        email = f"{local_part}@{domain.lower()}"
+
+        # 1. Fetch the user and their most recent tenant in one round-trip;
+        # the is_active predicate lives in SQL so disabled accounts never
+        # reach the expensive password verify, and the outer joins keep
+        # tenant-less users visible so the error paths below still apply
+        result = await db.execute(
+            select(User, UserTenant, Tenant)
+            .outerjoin(UserTenant, UserTenant.user_id == User.id)
+            .outerjoin(Tenant, UserTenant.tenant_id == Tenant.id)
+            .where(User.email == email)
+            .where(User.is_active.is_(True))
+            .order_by(UserTenant.created_at.desc())
+            .limit(1)
+        )
+        row = result.first()
+
+        if not row:
+            # Burn the same verify cost as the found-user path so response
+            # timing doesn't reveal whether the account exists
+            await asyncio.to_thread(verify_password, request.password, _DUMMY_PASSWORD_HASH)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid email or password",
             )
-        
-        # 2. Verify password
-        if not verify_password(request.password, user.hashed_password):
+
+        user, user_tenant, tenant = row
+
+        # 2. Verify password in a thread (same CPU cost as hashing)
+        if not await asyncio.to_thread(verify_password, request.password, user.hashed_password):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid email or password",
             )
-        
-        # Check if user is active
-        if not user.is_active:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Account is disabled",
-            )
-        
-        # 3. Get user's default tenant (first one, or most recent)
-        result = await db.execute(
-            select(UserTenant, Tenant)
-            .join(Tenant, UserTenant.tenant_id == Tenant.id)
-            .where(UserTenant.user_id == user.id)
-            .order_by(UserTenant.created_at.desc())
-        )
-        user_tenant_data = result.first()
-        
-        if not user_tenant_data:
+
+        # Transparently upgrade legacy bcrypt hashes to argon2 while we
+        # still have the plaintext in hand
+        if password_needs_rehash(user.hashed_password):
+            user.hashed_password = await asyncio.to_thread(hash_password, request.password)
+            await db.commit()
+
+        # 3. Require a tenant context
+        if user_tenant is None:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="No tenant associated with user",
             )
         
-        user_tenant, tenant = user_tenant_data
-        
         # 4. Generate tokens with tenant context
         # Handle role being Enum or string
         role_value = user_tenant.role.value if hasattr(user_tenant.role, 'value') else str(user_tenant.role)
@@ -273,44 +324,41 @@ async def refresh_token_endpoint(request: RefreshRequest, db: AsyncSession = Dep
                 detail="Invalid token",
             )
         
-        # 2. Get user and tenant info
-        result = await db.execute(select(User).where(User.id == int(user_id)))
-        user = result.scalar_one_or_none()
-        
-        if not user or not user.is_active:
+        # 2. Get user and tenant info in one round-trip. The tenant filter
+        # lives in the join condition, not the WHERE clause, so a user
+        # without access to the requested tenant still yields a row (with
+        # NULL membership) and keeps the 403-vs-401 distinction below.
+        # Without a requested tenant, the most recent membership is used.
+        membership_join = UserTenant.user_id == User.id
+        if request.tenant_id is not None:
+            membership_join = and_(
+                membership_join, UserTenant.tenant_id == request.tenant_id
+            )
+
+        result = await db.execute(
+            select(User, UserTenant, Tenant)
+            .outerjoin(UserTenant, membership_join)
+            .outerjoin(Tenant, UserTenant.tenant_id == Tenant.id)
+            .where(User.id == int(user_id))
+            .order_by(UserTenant.created_at.desc())
+            .limit(1)
+        )
+        row = result.first()
+
+        if not row or not row[0].is_active:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="User not found or inactive",
             )
-        
-        # Determine tenant context:
-        # - If tenant_id is provided, validate membership and use it
-        # - Otherwise, use the most recently associated tenant as default
-        if request.tenant_id is not None:
-            result = await db.execute(
-                select(UserTenant, Tenant)
-                .join(Tenant, UserTenant.tenant_id == Tenant.id)
-                .where(UserTenant.user_id == user.id)
-                .where(UserTenant.tenant_id == request.tenant_id)
-            )
-            user_tenant_data = result.first()
-        else:
-            result = await db.execute(
-                select(UserTenant, Tenant)
-                .join(Tenant, UserTenant.tenant_id == Tenant.id)
-                .where(UserTenant.user_id == user.id)
-                .order_by(UserTenant.created_at.desc())
-            )
-            user_tenant_data = result.first()
-        
-        if not user_tenant_data:
+
+        user, user_tenant, tenant = row
+
+        if user_tenant is None:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN if request.tenant_id is not None else status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="User does not have access to requested tenant" if request.tenant_id is not None else "No tenant associated with user",
             )
         
-        user_tenant, tenant = user_tenant_data
-        
         # 3. Generate new access token
         token_data = {
             "sub": str(user.id),
@@ -345,30 +393,33 @@ async def get_current_user_info(
     db: AsyncSession = Depends(get_db),
 ):
     """Get current user information from token."""
-    # Fetch full user and tenant details
+    # Select just the scalar columns the response needs: skips ORM entity
+    # hydration, and driving the join from user_tenants lets Postgres
+    # answer the membership check from the covering index alone
     result = await db.execute(
-        select(User, Tenant)
-        .join(UserTenant, UserTenant.user_id == User.id)
-        .join(Tenant, UserTenant.tenant_id == Tenant.id)
-        .where(User.id == current_user["user_id"])
-        .where(Tenant.id == current_user["tenant_id"])
+        select(User.email, User.full_name, Tenant.name)
+        .select_from(UserTenant)
+        .join(User, User.id == UserTenant.user_id)
+        .join(Tenant, Tenant.id == UserTenant.tenant_id)
+        .where(UserTenant.user_id == current_user["user_id"])
+        .where(UserTenant.tenant_id == current_user["tenant_id"])
     )
-    user_data = result.first()
-    
-    if not user_data:
+    row = result.first()
+
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User or tenant not found",
         )
-    
-    user, tenant = user_data
-    
+
+    email, full_name, tenant_name = row
+
     return {
-        "id": user.id,
-        "email": user.email,
-        "full_name": user.full_name,
-        "tenant_id": tenant.id,
-        "tenant_name": tenant.name,
+        "id": current_user["user_id"],
+        "email": email,
+        "full_name": full_name,
+        "tenant_id": current_user["tenant_id"],
+        "tenant_name": tenant_name,
         "role": current_user.get("role", "viewer"),
     }
 
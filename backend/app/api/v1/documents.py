@@ -1,22 +1,28 @@
 """Document upload and management endpoints."""
 
 import asyncio
+import hashlib
+import tempfile
+import uuid
 from datetime import datetime
 from pathlib import Path
-from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, status, BackgroundTasks
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete
-from pydantic import BaseModel
 
+import aiofiles
+from fastapi import APIRouter, Depends, Request, UploadFile, File, HTTPException, status, BackgroundTasks
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, insert, select, delete
+from app.core.config import settings
 from app.core.database import get_db, AsyncSessionLocal
 from app.core.security import get_current_user, require_role, require_tenant_access
-from app.models.document import Document, DocumentStatus
+from app.models.document import Chunk, Document, DocumentStatus
 from app.services.storage import storage_service
-from app.services.ingestion import ingestion_service
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
-router = APIRouter()
+# orjson serializes response dicts (datetimes included) natively, skipping
+# Pydantic response-model re-validation on these read-heavy endpoints
+router = APIRouter(default_response_class=ORJSONResponse)
 
 # Allowed file types
 ALLOWED_FILE_TYPES = {
@@ -27,37 +33,68 @@ ALLOWED_FILE_TYPES = {
     "application/vnd.openxmlformats-officedocument.wordprocessingml.document": "docx",
 }
 
-ALLOWED_EXTENSIONS = {".pdf", ".csv", ".md", ".txt", ".docx"}
+ALLOWED_EXTENSIONS = frozenset({"pdf", "csv", "md", "txt", "docx"})
 
+# Magic-byte signatures for the binary formats we accept; the text formats
+# (csv/md/txt) have none. Checked against the first streamed chunk so a
+# mislabelled file is rejected before it reaches the ingestion pipeline.
+MAGIC_SIGNATURES = {
+    "pdf": b"%PDF-",
+    "docx": b"PK\x03\x04",  # docx is a zip container
+}
 
-class DocumentResponse(BaseModel):
-    """Document response model."""
+MAX_UPLOAD_SIZE = 10 * 1024 * 1024  # 10MB
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # Stream uploads in 1MB chunks
 
-    id: int
-    filename: str
-    file_type: str
-    file_size: int
-    status: str
-    created_at: str
 
+# Pending ingestion jobs. A burst of uploads used to open one session (and
+# check out one pool connection) per document; instead, jobs queue up here
+# and a single drainer works through them reusing one session per burst.
+_ingest_queue: asyncio.Queue = asyncio.Queue()
+_ingest_drainer_running = False
+
+
+async def _drain_ingest_queue():
+    """Process every queued document with a single shared session."""
+    # Deferred: importing the ingestion service loads sentence-transformers,
+    # which API workers that never ingest shouldn't pay for at boot
+    from app.services.ingestion import ingestion_service
 
-async def process_document_background(document_id: int, file_path: str, file_type: str):
-    """Background task to process document."""
     async with AsyncSessionLocal() as db:
+        while not _ingest_queue.empty():
+            document_id, file_path, file_type = _ingest_queue.get_nowait()
+            try:
+                await ingestion_service.process_document(
+                    db=db,
+                    document_id=document_id,
+                    file_path=Path(file_path),
+                    file_type=file_type,
+                )
+            except Exception as e:
+                logger.error("background_processing_failed", document_id=document_id, error=str(e))
+
+
+async def process_document_background(document_id: int, file_path: str, file_type: str):
+    """Background task to process a document.
+
+    Enqueues the job; the first caller becomes the drainer, so concurrent
+    uploads share its session instead of each opening their own.
+    """
+    global _ingest_drainer_running
+    _ingest_queue.put_nowait((document_id, file_path, file_type))
+    if _ingest_drainer_running:
+        return
+    while not _ingest_queue.empty():
+        _ingest_drainer_running = True
         try:
-            from pathlib import Path
-            await ingestion_service.process_document(
-                db=db,
-                document_id=document_id,
-                file_path=Path(file_path),
-                file_type=file_type,
-            )
-        except Exception as e:
-            logger.error("background_processing_failed", document_id=document_id, error=str(e))
+            await _drain_ingest_queue()
+        finally:
+            _ingest_drainer_running = False
 
 
-@router.post("/upload", response_model=DocumentResponse, status_code=status.HTTP_201_CREATED)
+@router.post("/upload", status_code=status.HTTP_201_CREATED)
 async def upload_document(
+    request: Request,
     background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     current_user: dict = Depends(require_role("member")),  # Members can upload
@@ -82,84 +119,160 @@ async def upload_document(
                 detail="No filename provided",
             )
         
-        # Check file extension
-        file_ext = Path(file.filename).suffix.lower()
-        if file_ext not in ALLOWED_EXTENSIONS:
+        # Check file extension: flat string scan + frozenset membership,
+        # no Path allocation on the hot path
+        dot = file.filename.rfind(".")
+        file_type = file.filename[dot + 1:].lower() if dot >= 0 else ""
+        if file_type not in ALLOWED_EXTENSIONS:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"File type not supported. Allowed: {', '.join(ALLOWED_EXTENSIONS)}",
+                detail=f"File type not supported. Allowed: {', '.join(sorted(ALLOWED_EXTENSIONS))}",
             )
-        
-        # Determine file type
-        file_type = file_ext[1:]  # Remove the dot
-        
-        # Check file size (max 10MB for now)
-        content = await file.read()
-        file_size = len(content)
-        
-        if file_size > 10 * 1024 * 1024:  # 10MB
+
+        # Reject oversized uploads early when the client declares a size,
+        # before reading a single body byte
+        content_length = request.headers.get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) > MAX_UPLOAD_SIZE:
             raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
                 detail="File too large. Maximum size is 10MB",
             )
-        
-        if file_size == 0:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="File is empty",
+
+        # Stream the upload to a temp file in fixed-size chunks instead of
+        # buffering the whole body in memory; the size cap is enforced
+        # mid-stream so an unbounded body can never fill RAM or disk
+        temp_dir = Path(tempfile.gettempdir()) / "agentic_workspace"
+        temp_path = temp_dir / f"upload_{uuid.uuid4().hex}.{file_type}"
+        await asyncio.to_thread(temp_dir.mkdir, parents=True, exist_ok=True)
+
+        expected_magic = MAGIC_SIGNATURES.get(file_type)
+        file_size = 0
+        hasher = hashlib.sha256()  # Hashing rides along with the streaming copy
+        try:
+            async with aiofiles.open(temp_path, "wb") as out:
+                while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                    if file_size == 0 and expected_magic and not chunk.startswith(expected_magic):
+                        raise HTTPException(
+                            status_code=status.HTTP_400_BAD_REQUEST,
+                            detail="File content does not match its extension",
+                        )
+                    file_size += len(chunk)
+                    if file_size > MAX_UPLOAD_SIZE:
+                        raise HTTPException(
+                            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                            detail="File too large. Maximum size is 10MB",
+                        )
+                    hasher.update(chunk)
+                    await out.write(chunk)
+
+            if file_size == 0:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="File is empty",
+                )
+
+            # Dedup: if this tenant already uploaded identical bytes, return
+            # the existing document instead of re-running the embedding
+            # pipeline (the temp file is cleaned up by the finally below).
+            # Failed documents don't count — re-uploading the same content
+            # is the retry path for a failed ingestion.
+            content_hash = hasher.hexdigest()
+            result = await db.execute(
+                select(Document)
+                .where(Document.tenant_id == current_user["tenant_id"])
+                .where(Document.content_hash == content_hash)
+                .where(Document.status != DocumentStatus.FAILED)
+                .limit(1)
             )
-        
-        # Generate storage key
-        storage_key = storage_service.generate_storage_key(
-            current_user["tenant_id"],
-            file.filename,
-        )
-        
-        # Save file to storage
-        from io import BytesIO
-        file_obj = BytesIO(content)
-        await storage_service.save_file(file_obj, storage_key)
-        
-        # Create document record
-        document = Document(
-            tenant_id=current_user["tenant_id"],
-            user_id=current_user["user_id"],
-            filename=file.filename,
-            file_type=file_type,
-            file_size=file_size,
-            status=DocumentStatus.PENDING,
-            storage_key=storage_key,
-            doc_metadata={},
+            existing = result.scalar_one_or_none()
+            if existing is not None:
+                logger.info(
+                    "document_upload_deduplicated",
+                    document_id=existing.id,
+                    filename=file.filename,
+                    tenant_id=current_user["tenant_id"],
+                )
+                return {
+                    "id": existing.id,
+                    "filename": existing.filename,
+                    "file_type": existing.file_type,
+                    "file_size": existing.file_size,
+                    "status": existing.status.value,
+                    "created_at": existing.created_at,
+                }
+
+            # Generate storage key
+            storage_key = storage_service.generate_storage_key(
+                current_user["tenant_id"],
+                file.filename,
+            )
+
+            # Save file to storage from disk, never from an in-memory buffer
+            with open(temp_path, "rb") as file_obj:
+                await storage_service.save_file(file_obj, storage_key)
+        finally:
+            await asyncio.to_thread(temp_path.unlink, missing_ok=True)
+
+        # Create document record: Core INSERT..RETURNING skips ORM
+        # identity-map bookkeeping and hands back exactly the two
+        # generated values the response needs
+        result = await db.execute(
+            insert(Document)
+            .values(
+                tenant_id=current_user["tenant_id"],
+                user_id=current_user["user_id"],
+                filename=file.filename,
+                file_type=file_type,
+                file_size=file_size,
+                status=DocumentStatus.PENDING,
+                storage_key=storage_key,
+                content_hash=content_hash,
+                doc_metadata={},
+            )
+            .returning(Document.id, Document.created_at)
         )
-        db.add(document)
+        document_id, created_at = result.first()
         await db.commit()
-        await db.refresh(document)
-        
-        logger.info(
+
+        # Structured logging serializes every kwarg; run it after the
+        # response instead of on the critical path
+        background_tasks.add_task(
+            logger.info,
             "document_uploaded",
-            document_id=document.id,
+            document_id=document_id,
             filename=file.filename,
             file_size=file_size,
             user_id=current_user["user_id"],
             tenant_id=current_user["tenant_id"],
         )
-        
-        # Trigger background processing
+
+        # Trigger background processing. With the task queue enabled the
+        # job goes to dedicated Celery workers and survives a web-process
+        # restart; the task_id doubles as an idempotency key so a retried
+        # enqueue can't double-process a document.
         file_full_path = await storage_service.get_file_path(storage_key)
-        background_tasks.add_task(
-            process_document_background,
-            document.id,
-            str(file_full_path),
-            file_type,
-        )
-        
+        if settings.ENABLE_TASK_QUEUE:
+            from app.workers.celery_app import process_document_task
+
+            process_document_task.apply_async(
+                args=(document_id, str(file_full_path), file_type),
+                task_id=f"doc-{document_id}",
+            )
+        else:
+            background_tasks.add_task(
+                process_document_background,
+                document_id,
+                str(file_full_path),
+                file_type,
+            )
+
         return {
-            "id": document.id,
-            "filename": document.filename,
-            "file_type": document.file_type,
-            "file_size": document.file_size,
-            "status": document.status.value,
-            "created_at": document.created_at.isoformat(),
+            "id": document_id,
+            "filename": file.filename,
+            "file_type": file_type,
+            "file_size": file_size,
+            "status": DocumentStatus.PENDING.value,
+            "created_at": created_at,
         }
         
     except HTTPException:
@@ -172,7 +285,7 @@ async def upload_document(
         )
 
 
-@router.get("/", response_model=list[DocumentResponse])
+@router.get("/")
 async def list_documents(
     skip: int = 0,
     limit: int = 100,  # Default to 100 documents max per request
@@ -187,26 +300,32 @@ async def list_documents(
         if limit < 1 or limit > 500:  # Max 500 documents per request
             limit = 100
         
-        # Query documents filtered by tenant_id with pagination
-        result = await db.execute(
+        # Stream rows through a server-side cursor (200-row prefetch)
+        # instead of materializing every ORM object up front, so peak
+        # memory stays flat even for tenants with large page sizes
+        result = await db.stream_scalars(
             select(Document)
             .where(Document.tenant_id == current_user["tenant_id"])
             .order_by(Document.created_at.desc())
             .offset(skip)
             .limit(limit)
+            .execution_options(yield_per=200)
         )
-        
+
         documents = []
-        for doc in result.scalars():
-            documents.append({
-                "id": doc.id,
-                "filename": doc.filename,
-                "file_type": doc.file_type,
-                "file_size": doc.file_size or 0,
-                "status": doc.status.value,
-                "created_at": doc.created_at.isoformat(),
-            })
-        
+        try:
+            async for doc in result:
+                documents.append({
+                    "id": doc.id,
+                    "filename": doc.filename,
+                    "file_type": doc.file_type,
+                    "file_size": doc.file_size or 0,
+                    "status": doc.status.value,
+                    "created_at": doc.created_at,
+                })
+        finally:
+            await result.close()
+
         return documents
         
     except Exception as e:
@@ -225,28 +344,31 @@ async def get_document_stats(
 ):
     """Get document statistics (chunk count, etc.)."""
     try:
-        # Get document
+        # Fetch the document and its chunk count in one round trip: the
+        # correlated scalar subquery resolves to an index-only scan on
+        # chunks.document_id, so there's no reason to pay for two queries
         result = await db.execute(
-            select(Document)
+            select(
+                Document,
+                select(func.count(Chunk.id))
+                .where(Chunk.document_id == Document.id)
+                .scalar_subquery()
+                .label("chunk_count"),
+            )
             .where(Document.id == document_id)
             .where(Document.tenant_id == current_user["tenant_id"])
         )
-        document = result.scalar_one_or_none()
-        
-        if not document:
+        row = result.first()
+
+        if not row:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Document not found",
             )
-        
-        # Count chunks
-        from sqlalchemy import func
-        result = await db.execute(
-            select(func.count(Chunk.id))
-            .where(Chunk.document_id == document_id)
-        )
-        chunk_count = result.scalar() or 0
-        
+
+        document, chunk_count = row
+        chunk_count = chunk_count or 0
+
         return {
             "document_id": document.id,
             "filename": document.filename,
@@ -266,7 +388,7 @@ async def get_document_stats(
         )
 
 
-@router.get("/{document_id}", response_model=DocumentResponse)
+@router.get("/{document_id}")
 async def get_document(
     document_id: int,
     current_user: dict = Depends(require_tenant_access),
@@ -293,7 +415,7 @@ async def get_document(
             "file_type": document.file_type,
             "file_size": document.file_size or 0,
             "status": document.status.value,
-            "created_at": document.created_at.isoformat(),
+            "created_at": document.created_at,
         }
         
     except HTTPException:
@@ -1,32 +1,76 @@
 """RAG query endpoints with streaming support."""
 
 import asyncio
-import json
+import hashlib
 import time
+from collections import deque
+from functools import lru_cache
+from operator import itemgetter
 from typing import AsyncIterator
 from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import StreamingResponse
+from fastapi.responses import ORJSONResponse, StreamingResponse
+import orjson
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 
 from app.core.database import get_db
 from app.core.security import get_current_user, require_tenant_access
-from app.services.retriever import RetrieverService
-from app.services.answer_engine import AnswerEngineService
+from app.services.answer_engine import CANNED_RESPONSES, AnswerEngineService
 from app.core.config import settings
 from app.core.logging import get_logger
 from app.services.evaluation import evaluation_service
+from app.services.query_cache import query_cache
 
 logger = get_logger(__name__)
-router = APIRouter()
+# ORJSON for the non-streaming responses; SSE frames are already raw bytes
+router = APIRouter(default_response_class=ORJSONResponse)
 
-# Initialize services
-retriever_service = RetrieverService()
+# The answer engine is cheap to construct (its LLM clients are lazy);
+# the retriever is not — it loads the embedding and reranker models — so
+# it is built on first use instead of at worker import
 answer_engine = AnswerEngineService()
 
+
+@lru_cache(maxsize=1)
+def _get_retriever():
+    """Construct the retrieval service (and its models) on first request."""
+    from app.services.retriever import RetrieverService
+
+    return RetrieverService()
+
 # Guard against GC canceling background eval tasks
 _eval_tasks: set = set()
 
+# In-flight retrievals, so concurrent identical queries (a class asking the
+# same question, a double-clicked submit) share one pipeline run instead of
+# each hitting pgvector
+_inflight: dict[tuple, asyncio.Future] = {}
+_inflight_lock = asyncio.Lock()
+
+# Pre-encoded SSE frame fragments; only the varying payload goes through
+# the (Rust-backed) orjson encoder, everything else is static bytes
+_FRAME_SUFFIX = b"\n\n"
+_DONE_FRAME = b"data: [DONE]\n\n"
+# Reconnect hint for EventSource clients (SSE retry: field, milliseconds)
+_RETRY_FRAME = b"retry: 2000\n\n"
+# Each token frame repeats this many trailing tokens, so a client that
+# missed a frame on a lossy link can resynchronize from the next one
+# instead of stalling until TCP retransmits
+_RECENT_WINDOW = 4
+# Bounded token buffer between the LLM producer and the SSE writer: a slow
+# client stalls the producer at the queue instead of letting generation run
+# arbitrarily far ahead of what can be delivered
+_STREAM_BUFFER_SIZE = 32
+# SSE comment emitted when no token arrives for a while, so idle-connection
+# proxies don't drop a stream that is merely waiting on the LLM
+_HEARTBEAT_FRAME = b": keepalive\n\n"
+_HEARTBEAT_INTERVAL_SECONDS = 25
+
+
+def _sse_frame(seq: int, payload: dict) -> bytes:
+    """Encode one sequenced SSE frame (id: line + orjson data: line)."""
+    return b"id: " + str(seq).encode() + b"\ndata: " + orjson.dumps(payload) + _FRAME_SUFFIX
+
 
 class QueryRequest(BaseModel):
     """RAG query request."""
@@ -35,23 +79,94 @@ class QueryRequest(BaseModel):
     document_ids: list[int] | None = None
 
 
-class SourceResponse(BaseModel):
-    """Source citation response."""
+_source_fields = itemgetter("id", "document_name", "content", "metadata")
+
+
+def _format_sources(chunks: list[dict]) -> list[dict]:
+    """Build the top-5 source payloads in one comprehension pass."""
+    return [
+        {
+            "id": chunk_id,
+            "document_name": document_name,
+            "snippet": content[:200] + "..." if len(content) > 200 else content,
+            "metadata": metadata,
+        }
+        for chunk_id, document_name, content, metadata in map(_source_fields, chunks[:5])
+    ]
+
+
+async def _retrieve_chunks(
+    db: AsyncSession,
+    query: str,
+    tenant_id: int,
+    document_ids: list[int] | None,
+) -> list[dict]:
+    """Retrieve chunks, short-circuiting through the semantic cache.
 
-    id: int
-    document_name: str
-    snippet: str
-    metadata: dict
+    Exact repeats skip even the query embedding; near-duplicates (cosine
+    >= 0.97 against a recent cached query) reuse the cached chunks and
+    skip the whole expansion + pgvector + BM25 + rerank pipeline.
+    """
+    chunks = query_cache.lookup_exact(tenant_id, query, document_ids)
+    if chunks is not None:
+        return chunks
+
+    query_embedding = await _get_retriever().embed_query(query)
+    chunks = query_cache.lookup(tenant_id, query_embedding, document_ids)
+    if chunks is not None:
+        return chunks
 
+    # Coalesce: if an identical retrieval is already running, await its
+    # result instead of starting another pipeline pass
+    key = (
+        tenant_id,
+        hashlib.blake2b(query.encode(), digest_size=16).digest(),
+        tuple(sorted(document_ids)) if document_ids else (),
+    )
+    async with _inflight_lock:
+        future = _inflight.get(key)
+        if future is not None:
+            leader = False
+        else:
+            future = asyncio.get_running_loop().create_future()
+            _inflight[key] = future
+            leader = True
 
-class QueryResponse(BaseModel):
-    """RAG query response."""
+    if not leader:
+        try:
+            return list(await future)
+        except asyncio.CancelledError:
+            if future.cancelled():
+                # Leader disconnected mid-retrieval; run our own pass
+                return await _retrieve_chunks(db, query, tenant_id, document_ids)
+            raise
 
-    answer: str
-    sources: list[SourceResponse]
+    try:
+        chunks = await _get_retriever().retrieve(
+            db=db,
+            query=query,
+            tenant_id=tenant_id,
+            document_ids=document_ids,
+            top_k=15,  # Increased for more comprehensive answers
+        )
+        query_cache.insert(tenant_id, query, query_embedding, chunks, document_ids)
+        future.set_result(chunks)
+        return chunks
+    except Exception as e:
+        future.set_exception(e)
+        # Mark retrieved so a follower-less failure doesn't warn at GC time
+        future.exception()
+        raise
+    finally:
+        # A cancelled leader (client disconnect) skips the except block; the
+        # future must still resolve or every coalesced follower hangs forever
+        if not future.done():
+            future.cancel()
+        async with _inflight_lock:
+            _inflight.pop(key, None)
 
 
-@router.post("/query", response_model=QueryResponse)
+@router.post("/query")
 async def query_documents(
     request: QueryRequest,
     current_user: dict = Depends(require_tenant_access),
@@ -73,23 +188,38 @@ async def query_documents(
     """
     try:
         start_time = time.time()
-        
-        # Check if query is conversational (before retrieval to save resources)
-        is_conversational = answer_engine._is_conversational_query(request.query)
-        
-        # 1. Retrieve relevant chunks with advanced retrieval pipeline
-        # Uses hybrid search (vector + BM25), re-ranking, and query expansion
-        # Skip retrieval for conversational queries
-        chunks = []
-        if not is_conversational:
-            chunks = await retriever_service.retrieve(
-                db=db,
-                query=request.query,
+
+        # Conversational queries bypass retrieval and the LLM entirely:
+        # a canned response keyed on the detected intent is the whole answer
+        bucket = answer_engine._is_conversational_query(request.query)
+        if bucket:
+            logger.info(
+                "rag_query_conversational",
+                query=request.query[:100],
+                bucket=bucket,
                 tenant_id=current_user["tenant_id"],
-                document_ids=request.document_ids,
-                top_k=15,  # Increased for more comprehensive answers
             )
-        
+            return {
+                "answer": CANNED_RESPONSES.get(bucket, CANNED_RESPONSES["default"]),
+                "sources": [],
+            }
+
+        # 1. Retrieve relevant chunks with advanced retrieval pipeline
+        # (hybrid search, re-ranking, query expansion), overlapped with LLM
+        # client construction — a no-op once memoized, but on a cold process
+        # the client handshake setup rides the retrieval wait for free
+        async with asyncio.TaskGroup() as tg:
+            t_chunks = tg.create_task(
+                _retrieve_chunks(
+                    db=db,
+                    query=request.query,
+                    tenant_id=current_user["tenant_id"],
+                    document_ids=request.document_ids,
+                )
+            )
+            tg.create_task(asyncio.to_thread(answer_engine._get_llm))
+        chunks = t_chunks.result()
+
         # 2. Generate professional answer using answer engine
         answer = await answer_engine.generate_answer(
             query=request.query,
@@ -100,13 +230,7 @@ async def query_documents(
         # Only include sources if chunks are relevant
         sources = []
         if chunks and answer_engine._chunks_are_relevant(chunks):
-            for chunk in chunks[:5]:  # Return top 5 sources
-                sources.append({
-                    "id": chunk["id"],
-                    "document_name": chunk["document_name"],
-                    "snippet": chunk["content"][:200] + "..." if len(chunk["content"]) > 200 else chunk["content"],
-                    "metadata": chunk["metadata"],
-                })
+            sources = _format_sources(chunks)
         
         latency_ms = (time.time() - start_time) * 1000
         
@@ -157,46 +281,132 @@ async def query_documents_stream(
     Streams professional-formatted answer tokens in real-time, then sends sources.
     """
     
-    async def generate() -> AsyncIterator[str]:
+    async def generate() -> AsyncIterator[bytes]:
         """Generate streaming response with professional answer engine."""
         try:
             start_time = time.time()
 
-            is_conversational = answer_engine._is_conversational_query(request.query)
-            chunks = []
-            if not is_conversational:
-                chunks = await retriever_service.retrieve(
-                    db=db,
-                    query=request.query,
+            # Conversational queries: stream the canned answer as a single
+            # token frame and finish — no retrieval, no LLM round-trip
+            bucket = answer_engine._is_conversational_query(request.query)
+            if bucket:
+                canned = CANNED_RESPONSES.get(bucket, CANNED_RESPONSES["default"])
+                yield _RETRY_FRAME
+                yield _sse_frame(1, {"type": "token", "seq": 1, "content": canned, "recent": [canned]})
+                yield _sse_frame(2, {"type": "sources", "seq": 2, "sources": []})
+                yield _DONE_FRAME
+                logger.info(
+                    "rag_stream_conversational",
+                    query=request.query[:100],
+                    bucket=bucket,
                     tenant_id=current_user["tenant_id"],
-                    document_ids=request.document_ids,
-                    top_k=15,
                 )
+                return
+
+            # Overlap retrieval with (memoized) streaming-client construction
+            async with asyncio.TaskGroup() as tg:
+                t_chunks = tg.create_task(
+                    _retrieve_chunks(
+                        db=db,
+                        query=request.query,
+                        tenant_id=current_user["tenant_id"],
+                        document_ids=request.document_ids,
+                    )
+                )
+                tg.create_task(asyncio.to_thread(answer_engine._get_llm_stream))
+            chunks = t_chunks.result()
+
+            # Release the connection before the LLM streaming loop: LLM
+            # generation runs for tens of seconds and the pool slot would
+            # otherwise sit idle that whole time. (Plain sessions without
+            # the lazy proxy's `used` flag are released unconditionally.)
+            if getattr(db, "used", True):
+                await db.commit()
+                await db.close()
 
             full_answer_tokens: list[str] = []
+            seq = 0
+            recent: deque = deque(maxlen=_RECENT_WINDOW)
 
-            async for token in answer_engine.generate_answer_stream(
-                query=request.query,
-                chunks=chunks,
-            ):
-                full_answer_tokens.append(token)
-                token_data = {"type": "token", "content": token}
-                yield f"data: {json.dumps(token_data)}\n\n"
+            yield _RETRY_FRAME
+
+            # Tokens flow through a bounded queue: the producer task blocks
+            # when the client falls _STREAM_BUFFER_SIZE tokens behind, and a
+            # client disconnect cancels the producer, closing the LLM stream
+            # instead of generating into the void
+            queue: asyncio.Queue = asyncio.Queue(maxsize=_STREAM_BUFFER_SIZE)
+
+            async def _produce() -> None:
+                try:
+                    async for token in answer_engine.generate_answer_stream(
+                        query=request.query,
+                        chunks=chunks,
+                    ):
+                        await queue.put(("token", token))
+                    await queue.put(("done", None))
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    await queue.put(("error", e))
+
+            producer = asyncio.create_task(_produce())
+            coalesce_delay = settings.SSE_COALESCE_MS / 1000
+            pending: tuple | None = None
+            try:
+                while True:
+                    if pending is not None:
+                        kind, value = pending
+                        pending = None
+                    else:
+                        try:
+                            kind, value = await asyncio.wait_for(
+                                queue.get(), timeout=_HEARTBEAT_INTERVAL_SECONDS
+                            )
+                        except asyncio.TimeoutError:
+                            yield _HEARTBEAT_FRAME
+                            continue
+                    if kind == "done":
+                        break
+                    if kind == "error":
+                        raise value
+
+                    # Coalesce tokens that arrive within the window into one
+                    # frame: same bytes for the client to concatenate, far
+                    # fewer writes for a fast-producing model
+                    batch = [value]
+                    if coalesce_delay:
+                        await asyncio.sleep(coalesce_delay)
+                    while pending is None:
+                        try:
+                            next_kind, next_value = queue.get_nowait()
+                        except asyncio.QueueEmpty:
+                            break
+                        if next_kind == "token":
+                            batch.append(next_value)
+                        else:
+                            # done/error marker: handle after this frame
+                            pending = (next_kind, next_value)
+
+                    content = "".join(batch)
+                    full_answer_tokens.append(content)
+                    seq += 1
+                    recent.append(content)
+                    yield _sse_frame(
+                        seq,
+                        {"type": "token", "seq": seq, "content": content, "recent": list(recent)},
+                    )
+            finally:
+                if not producer.done():
+                    producer.cancel()
 
             latency_ms = (time.time() - start_time) * 1000
 
             sources = []
             if chunks and answer_engine._chunks_are_relevant(chunks):
-                for chunk in chunks[:5]:
-                    sources.append({
-                        "id": chunk["id"],
-                        "document_name": chunk["document_name"],
-                        "snippet": chunk["content"][:200] + "..." if len(chunk["content"]) > 200 else chunk["content"],
-                        "metadata": chunk["metadata"],
-                    })
+                sources = _format_sources(chunks)
 
-            sources_data = {"type": "sources", "sources": sources}
-            yield f"data: {json.dumps(sources_data)}\n\n"
+            seq += 1
+            yield _sse_frame(seq, {"type": "sources", "seq": seq, "sources": sources})
 
             # Record evaluation run after streaming completes
             _task = asyncio.create_task(
@@ -212,7 +422,7 @@ async def query_documents_stream(
             _eval_tasks.add(_task)
             _task.add_done_callback(_eval_tasks.discard)
 
-            yield "data: [DONE]\n\n"
+            yield _DONE_FRAME
 
             logger.info(
                 "rag_stream_completed",
@@ -225,8 +435,8 @@ async def query_documents_stream(
         except Exception as e:
             logger.error("rag_stream_failed", error=str(e), query=request.query[:100])
             error_data = {"type": "error", "content": f"An error occurred: {str(e)}"}
-            yield f"data: {json.dumps(error_data)}\n\n"
-            yield "data: [DONE]\n\n"
+            yield b"data: " + orjson.dumps(error_data) + _FRAME_SUFFIX
+            yield _DONE_FRAME
     
     return StreamingResponse(generate(), media_type="text/event-stream")
 
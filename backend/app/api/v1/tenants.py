@@ -1,5 +1,6 @@
 """Tenant management endpoints."""
 
+import itertools
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
@@ -37,24 +38,24 @@ async def list_tenants(
 ):
     """List all tenants for the current user."""
     try:
-        # Query user_tenants joined with tenants
+        # Project just the four columns the response needs instead of
+        # hydrating full UserTenant + Tenant entities per membership
         result = await db.execute(
-            select(UserTenant, Tenant)
-            .join(Tenant, UserTenant.tenant_id == Tenant.id)
+            select(Tenant.id, Tenant.name, Tenant.slug, UserTenant.role)
+            .join(UserTenant, UserTenant.tenant_id == Tenant.id)
             .where(UserTenant.user_id == current_user["user_id"])
             .order_by(UserTenant.created_at.desc())
         )
-        
-        tenants = []
-        for user_tenant, tenant in result:
-            tenants.append({
-                "id": tenant.id,
-                "name": tenant.name,
-                "slug": tenant.slug,
-                "role": user_tenant.role.value,
-            })
-        
-        return tenants
+
+        return [
+            {
+                "id": tenant_id,
+                "name": name,
+                "slug": slug,
+                "role": role.value,
+            }
+            for tenant_id, name, slug, role in result.all()
+        ]
         
     except Exception as e:
         logger.error("list_tenants_failed", error=str(e))
@@ -75,19 +76,21 @@ async def create_tenant(
         # Generate slug if not provided
         slug = request.slug or request.name.lower().replace(" ", "-")
         
-        # Validate slug is unique
-        result = await db.execute(select(Tenant).where(Tenant.slug == slug))
-        if result.scalar_one_or_none():
-            # Make slug unique
-            counter = 1
-            base_slug = slug
-            while True:
-                slug = f"{base_slug}-{counter}"
-                result = await db.execute(select(Tenant).where(Tenant.slug == slug))
-                if not result.scalar_one_or_none():
-                    break
-                counter += 1
-        
+        # Ensure unique slug: fetch all colliding slugs in one query and
+        # pick the first free suffix in Python, instead of one round-trip
+        # per candidate (same approach as registration)
+        base_slug = slug
+        result = await db.execute(
+            select(Tenant.slug).where(Tenant.slug.like(f"{base_slug}%"))
+        )
+        taken = set(result.scalars())
+        if base_slug in taken:
+            slug = next(
+                candidate
+                for candidate in (f"{base_slug}-{i}" for i in itertools.count(1))
+                if candidate not in taken
+            )
+
         # Create tenant
         new_tenant = Tenant(
             name=request.name,
@@ -53,11 +53,21 @@ class Settings(BaseSettings):
     # LLM Configuration
     LLM_PROVIDER: str = "gemini"  # "openai", "anthropic", "gemini", or "groq"
     LLM_MODEL: str = "gemini-1.5-flash"
+    # Coalesce concurrent report LLM calls into one batched call; trades a
+    # little per-request latency for throughput, so off by default
+    ENABLE_REPORT_BATCHING: bool = False
+    # Merge SSE tokens arriving within this window into one frame (fewer
+    # writes/syscalls per stream); 0 disables coalescing
+    SSE_COALESCE_MS: int = 10
     
     # Embeddings Configuration (FREE, LOCAL - No API needed!)
     EMBEDDING_PROVIDER: str = "local"  # local (free, no API) or "gemini" or "openai"
     EMBEDDING_MODEL: str = "all-MiniLM-L6-v2"  # Sentence Transformers: 384 dims
     EMBEDDING_DIMENSION: int = 384  # Local: 384, Gemini: 768, OpenAI: 1536
+    # Secondary IVFFlat index for bulk/analytical scans (builds ~30x faster
+    # than HNSW at lower QPS); off by default so small deployments skip the
+    # storage cost
+    ENABLE_IVFFLAT_INDEX: bool = False
 
     # LangSmith
     LANGSMITH_API_KEY: str = ""
@@ -74,6 +84,10 @@ class Settings(BaseSettings):
 
     # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
+    # Route document ingestion through the Celery queue (requires Redis and
+    # a running worker); off by default so single-process deployments keep
+    # working with in-process BackgroundTasks
+    ENABLE_TASK_QUEUE: bool = False
 
     # Integrations
     JIRA_URL: str = ""
@@ -2,7 +2,10 @@
 
 import base64
 import os
-from cryptography.fernet import Fernet
+from binascii import a2b_base64
+from functools import lru_cache
+import orjson
+from cryptography.fernet import Fernet, InvalidToken
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 from typing import Dict, Any
@@ -12,23 +15,36 @@ from app.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+# urlsafe -> standard alphabet, precomputed once; binascii.a2b_base64 is a
+# thin C wrapper without the alphabet-validation overhead of base64's
+# urlsafe helpers
+_B64_URLSAFE_TO_STD = bytes.maketrans(b"-_", b"+/")
+
+
+@lru_cache(maxsize=1)
+def _derive_fernet_key(secret: str) -> bytes:
+    """Derive the Fernet key from the app secret, once per process.
+
+    The salt is static, so the 100k-iteration PBKDF2 chain always yields
+    the same key for a given secret — re-running it on every construction
+    was pure wasted CPU. cryptography's OpenSSL backend dispatches the
+    HMAC rounds to hardware SHA extensions where available.
+    """
+    kdf = PBKDF2HMAC(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=b'tenant_credentials_salt',  # In production, use a unique salt per tenant
+        iterations=100000,
+    )
+    return base64.urlsafe_b64encode(kdf.derive(secret.encode()))
+
 
 class CredentialEncryption:
     """Encrypt and decrypt tenant credentials using Fernet symmetric encryption."""
-    
+
     def __init__(self):
         """Initialize encryption with key derived from JWT_SECRET_KEY."""
-        # Derive encryption key from JWT_SECRET_KEY
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=b'tenant_credentials_salt',  # In production, use a unique salt per tenant
-            iterations=100000,
-        )
-        key = base64.urlsafe_b64encode(
-            kdf.derive(settings.JWT_SECRET_KEY.encode())
-        )
-        self.cipher = Fernet(key)
+        self.cipher = Fernet(_derive_fernet_key(settings.JWT_SECRET_KEY))
     
     def encrypt(self, data: Dict[str, Any]) -> str:
         """
@@ -41,10 +57,10 @@ class CredentialEncryption:
             Encrypted string (base64 encoded)
         """
         try:
-            import json
-            json_data = json.dumps(data)
-            encrypted = self.cipher.encrypt(json_data.encode())
-            return base64.urlsafe_b64encode(encrypted).decode()
+            # Fernet output is already urlsafe base64; wrapping it in
+            # another b64encode pass (as older payloads did) inflated the
+            # stored ciphertext ~33% for zero security benefit
+            return self.cipher.encrypt(orjson.dumps(data)).decode("ascii")
         except Exception as e:
             logger.error("encryption_failed", error=str(e))
             raise ValueError(f"Failed to encrypt credentials: {str(e)}")
@@ -60,10 +76,16 @@ class CredentialEncryption:
             Decrypted dictionary
         """
         try:
-            import json
-            decoded = base64.urlsafe_b64decode(encrypted_data.encode())
-            decrypted = self.cipher.decrypt(decoded)
-            return json.loads(decrypted.decode())
+            try:
+                decrypted = self.cipher.decrypt(encrypted_data.encode("ascii"))
+            except InvalidToken:
+                # Legacy rows carry the extra base64 wrapper; unwrap once
+                # and retry so old credentials keep decrypting
+                decoded = a2b_base64(
+                    encrypted_data.encode("ascii").translate(_B64_URLSAFE_TO_STD)
+                )
+                decrypted = self.cipher.decrypt(decoded)
+            return orjson.loads(decrypted)
         except Exception as e:
             logger.error("decryption_failed", error=str(e))
             raise ValueError(f"Failed to decrypt credentials: {str(e)}")
@@ -1,20 +1,60 @@
 """Security utilities for authentication and authorization."""
 
+import hashlib
+import time
 from datetime import datetime, timedelta
-from typing import Optional
-from jose import JWTError, jwt
+from typing import Dict, Optional, Tuple
+import jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 from app.core.config import settings
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing: Argon2id for new hashes (faster than bcrypt at equal
+# security, native bindings via argon2-cffi); bcrypt stays verifiable so
+# existing hashes keep working and upgrade on next login
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated="auto",
+    argon2__time_cost=3,
+    argon2__memory_cost=65536,
+    argon2__parallelism=4,
+)
 
 # HTTP Bearer token scheme
 security = HTTPBearer()
 
+# Role hierarchy: owner > admin > member > viewer. Hoisted to module scope
+# so the per-request checker doesn't rebuild the dict on every call.
+_ROLE_LEVEL = {"owner": 4, "admin": 3, "member": 2, "viewer": 1}
+
+# Short-TTL cache of verified access tokens: a logged-in client replays the
+# same bearer token on every request, so re-running the HMAC check per call
+# is pure waste. Keyed on a token digest (not the raw token) so secrets
+# don't sit in RAM; the TTL is well under the access-token lifetime, and a
+# hit is only honoured while the embedded exp is still in the future.
+_TOKEN_CACHE_TTL_SECONDS = 30
+_TOKEN_CACHE_MAX_ENTRIES = 10_000
+_token_cache: Dict[str, Tuple[float, dict]] = {}
+
+
+def _decode_access_token_cached(token: str) -> dict:
+    """Decode a bearer token, reusing a recent verification if available."""
+    key = hashlib.sha256(token.encode()).hexdigest()[:32]
+    now = time.time()
+    cached = _token_cache.get(key)
+    if cached is not None:
+        cached_at, payload = cached
+        if now - cached_at < _TOKEN_CACHE_TTL_SECONDS and payload.get("exp", 0) > now:
+            return payload
+
+    payload = decode_token(token)
+    if len(_token_cache) >= _TOKEN_CACHE_MAX_ENTRIES:
+        _token_cache.clear()
+    _token_cache[key] = (now, payload)
+    return payload
+
 
 def hash_password(password: str) -> str:
     """Hash a plain password."""
@@ -26,6 +66,11 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Whether a stored hash uses a deprecated scheme (e.g. legacy bcrypt)."""
+    return pwd_context.needs_update(hashed_password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token."""
     to_encode = data.copy()
@@ -52,7 +97,7 @@ def decode_token(token: str) -> dict:
     try:
         payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
         return payload
-    except JWTError:
+    except jwt.InvalidTokenError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
@@ -69,7 +114,7 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials | None = De
             headers={"WWW-Authenticate": "Bearer"},
         )
     token = credentials.credentials
-    payload = decode_token(token)
+    payload = _decode_access_token_cached(token)
     
     if payload.get("type") != "access":
         raise HTTPException(
@@ -104,14 +149,12 @@ def require_role(required_role: str):
         async def admin_endpoint():
             ...
     """
+    # Resolved once at factory time; the per-request check is a single
+    # lookup and int compare
+    required_level = _ROLE_LEVEL.get(required_role, 0)
+
     async def role_checker(current_user: dict = Depends(get_current_user)) -> dict:
-        user_role = current_user.get("role", "viewer")
-        role_hierarchy = {"owner": 4, "admin": 3, "member": 2, "viewer": 1}
-        
-        user_level = role_hierarchy.get(user_role, 0)
-        required_level = role_hierarchy.get(required_role, 0)
-        
-        if user_level < required_level:
+        if _ROLE_LEVEL.get(current_user.get("role", "viewer"), 0) < required_level:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"Insufficient permissions. Required role: {required_role} or higher",
@@ -1,18 +1,20 @@
 """Email client for sending emails via SMTP."""
 
-import smtplib
+import aiosmtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from typing import List, Optional
 from typing import Dict
 
+from app.core.config import settings
 from app.core.logging import get_logger
+from app.services.smtp_pool import smtp_pool
 
 logger = get_logger(__name__)
 
 
 class EmailClient:
-    """SMTP email client for sending emails."""
+    """Async SMTP email client for sending emails."""
 
     def __init__(
         self,
@@ -24,7 +26,7 @@ class EmailClient:
     ):
         """
         Initialize email client.
-        
+
         Args:
             smtp_host: SMTP server hostname
             smtp_port: SMTP server port (587 for TLS, 465 for SSL)
@@ -38,7 +40,44 @@ class EmailClient:
         self.smtp_password = smtp_password
         self.use_tls = use_tls
 
-    def send_email(
+    def _build_message(
+        self,
+        to_emails: List[str],
+        subject: str,
+        body: str,
+        body_html: Optional[str] = None,
+        cc_emails: Optional[List[str]] = None,
+    ) -> MIMEMultipart:
+        """Build a MIME message from the parts."""
+        msg = MIMEMultipart("alternative")
+        msg["Subject"] = subject
+        msg["From"] = self.smtp_user
+        msg["To"] = ", ".join(to_emails)
+
+        if cc_emails:
+            msg["Cc"] = ", ".join(cc_emails)
+
+        msg.attach(MIMEText(body, "plain"))
+        if body_html:
+            msg.attach(MIMEText(body_html, "html"))
+
+        return msg
+
+    @staticmethod
+    def _all_recipients(
+        to_emails: List[str],
+        cc_emails: Optional[List[str]] = None,
+        bcc_emails: Optional[List[str]] = None,
+    ) -> List[str]:
+        """Flatten to/cc/bcc into the SMTP envelope recipient list."""
+        recipients = to_emails.copy()
+        if cc_emails:
+            recipients.extend(cc_emails)
+        if bcc_emails:
+            recipients.extend(bcc_emails)
+        return recipients
+
+    async def send_email(
         self,
         to_emails: List[str],
         subject: str,
@@ -48,8 +87,13 @@ class EmailClient:
         bcc_emails: Optional[List[str]] = None,
     ) -> Dict[str, str]:
         """
-        Send an email.
-        
+        Send an email, or queue it when the task queue is enabled.
+
+        With ENABLE_TASK_QUEUE the message is handed to a Celery worker
+        (which owns its own SMTP pool and retries with backoff) and the
+        caller returns in enqueue time; otherwise the send happens inline
+        on a pooled connection.
+
         Args:
             to_emails: List of recipient email addresses
             subject: Email subject
@@ -57,69 +101,143 @@ class EmailClient:
             body_html: Optional HTML email body
             cc_emails: Optional CC recipients
             bcc_emails: Optional BCC recipients
-        
+
         Returns:
-            Dict with status and message_id
+            Dict with status and message/task id
+        """
+        if settings.ENABLE_TASK_QUEUE:
+            from app.workers.celery_app import send_email_task
+
+            task = send_email_task.delay(
+                self.smtp_host,
+                self.smtp_port,
+                self.smtp_user,
+                self.smtp_password,
+                self.use_tls,
+                to_emails,
+                subject,
+                body,
+                body_html,
+                cc_emails,
+                bcc_emails,
+            )
+            logger.info("email_queued", to=to_emails, task_id=task.id)
+            return {
+                "status": "queued",
+                "message": f"Email queued for delivery (task {task.id})",
+            }
+
+        return await self._send_now(
+            to_emails, subject, body, body_html, cc_emails, bcc_emails
+        )
+
+    async def _send_now(
+        self,
+        to_emails: List[str],
+        subject: str,
+        body: str,
+        body_html: Optional[str] = None,
+        cc_emails: Optional[List[str]] = None,
+        bcc_emails: Optional[List[str]] = None,
+    ) -> Dict[str, str]:
+        """Send without blocking the event loop, on a pooled connection.
+
+        Connections come from the shared SMTP pool, so bursty sends reuse a
+        warm authenticated session instead of paying the TCP+TLS+AUTH
+        handshake on every message.
         """
         try:
-            # Create message
-            msg = MIMEMultipart("alternative")
-            msg["Subject"] = subject
-            msg["From"] = self.smtp_user
-            msg["To"] = ", ".join(to_emails)
-            
-            if cc_emails:
-                msg["Cc"] = ", ".join(cc_emails)
-            
-            # Add body parts
-            part1 = MIMEText(body, "plain")
-            msg.attach(part1)
-            
-            if body_html:
-                part2 = MIMEText(body_html, "html")
-                msg.attach(part2)
-            
-            # Collect all recipients
-            recipients = to_emails.copy()
-            if cc_emails:
-                recipients.extend(cc_emails)
-            if bcc_emails:
-                recipients.extend(bcc_emails)
-            
-            # Send email
-            with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
-                if self.use_tls:
-                    server.starttls()
-                server.login(self.smtp_user, self.smtp_password)
-                server.send_message(msg, to_addrs=recipients)
-            
+            msg = self._build_message(to_emails, subject, body, body_html, cc_emails)
+            recipients = self._all_recipients(to_emails, cc_emails, bcc_emails)
+
+            # Send via a pooled (possibly already-warm) connection
+            async with smtp_pool.acquire(
+                smtp_host=self.smtp_host,
+                smtp_port=self.smtp_port,
+                smtp_user=self.smtp_user,
+                smtp_password=self.smtp_password,
+                use_tls=self.use_tls,
+            ) as smtp:
+                await smtp.send_message(msg, recipients=recipients)
+
             logger.info(
                 "email_sent",
                 to=to_emails,
                 subject=subject[:50],
             )
-            
+
             return {
                 "status": "sent",
                 "message": f"Email sent successfully to {', '.join(to_emails)}",
             }
-            
-        except smtplib.SMTPException as e:
+
+        except aiosmtplib.SMTPException as e:
             logger.error("email_send_failed", error=str(e), to=to_emails)
             raise ValueError(f"Failed to send email: {str(e)}")
         except Exception as e:
             logger.error("email_unexpected_error", error=str(e))
             raise
 
-    def test_connection(self) -> bool:
+    async def _send_direct(
+        self,
+        to_emails: List[str],
+        subject: str,
+        body: str,
+        body_html: Optional[str] = None,
+        cc_emails: Optional[List[str]] = None,
+        bcc_emails: Optional[List[str]] = None,
+    ) -> Dict[str, str]:
+        """Send on a dedicated, unpooled connection.
+
+        For Celery workers: each task runs in its own short-lived event
+        loop, so connections parked in the process-singleton SMTP pool
+        would be bound to a dead loop by the next task (the same failure
+        mode the document worker avoids with NullPool). One fresh
+        connection per task is the right trade there.
+        """
+        try:
+            msg = self._build_message(to_emails, subject, body, body_html, cc_emails)
+            recipients = self._all_recipients(to_emails, cc_emails, bcc_emails)
+
+            smtp = aiosmtplib.SMTP(
+                hostname=self.smtp_host,
+                port=self.smtp_port,
+                start_tls=self.use_tls,
+            )
+            await smtp.connect()
+            await smtp.login(self.smtp_user, self.smtp_password)
+            try:
+                await smtp.send_message(msg, recipients=recipients)
+            finally:
+                await smtp.quit()
+
+            logger.info(
+                "email_sent",
+                to=to_emails,
+                subject=subject[:50],
+            )
+
+            return {
+                "status": "sent",
+                "message": f"Email sent successfully to {', '.join(to_emails)}",
+            }
+
+        except aiosmtplib.SMTPException as e:
+            logger.error("email_send_failed", error=str(e), to=to_emails)
+            raise ValueError(f"Failed to send email: {str(e)}")
+
+    async def test_connection(self) -> bool:
         """Test SMTP connection."""
         try:
-            with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
-                if self.use_tls:
-                    server.starttls()
-                server.login(self.smtp_user, self.smtp_password)
+            smtp = aiosmtplib.SMTP(
+                hostname=self.smtp_host,
+                port=self.smtp_port,
+                start_tls=self.use_tls,
+            )
+            await smtp.connect()
+            await smtp.login(self.smtp_user, self.smtp_password)
+            await smtp.quit()
             return True
         except Exception as e:
             logger.error("email_connection_test_failed", error=str(e))
             return False
-
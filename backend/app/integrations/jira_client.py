@@ -1,16 +1,34 @@
 """Jira API client for ticket creation."""
 
+import asyncio
 from typing import Dict, Optional
-from jira import JIRA
-from jira.exceptions import JIRAError
+
+import httpx
 
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Retry budget for rate-limited requests. Atlassian answers 429 with a
+# Retry-After header; when it's missing we back off exponentially.
+_MAX_RATE_LIMIT_RETRIES = 3
+_BACKOFF_BASE_SECONDS = 1.0
+
+_REQUEST_TIMEOUT = httpx.Timeout(30.0)
+_POOL_LIMITS = httpx.Limits(
+    max_connections=64,
+    max_keepalive_connections=20,
+    keepalive_expiry=30.0,
+)
+
 
 class JiraClient:
-    """Client for interacting with Jira API."""
+    """Async client for the Jira REST API.
+
+    Holds one httpx.AsyncClient per credential set, so every call reuses
+    warm keep-alive connections instead of paying a TCP+TLS handshake,
+    and honors Atlassian's 429 rate-limit responses instead of failing.
+    """
 
     def __init__(
         self,
@@ -20,32 +38,52 @@ class JiraClient:
     ):
         """
         Initialize Jira client.
-        
+
         Args:
             server_url: Jira server URL (e.g., https://yourcompany.atlassian.net)
             email: Jira user email
             api_token: Jira API token (from https://id.atlassian.com/manage-profile/security/api-tokens)
         """
-        self.server_url = server_url
+        self.server_url = server_url.rstrip("/")
         self.email = email
         self.api_token = api_token
-        self._client: Optional[JIRA] = None
+        self._client: Optional[httpx.AsyncClient] = None
 
-    def _get_client(self) -> JIRA:
-        """Get or create Jira client instance."""
-        if self._client is None:
-            try:
-                self._client = JIRA(
-                    server=self.server_url,
-                    basic_auth=(self.email, self.api_token),
-                )
-                logger.info("jira_client_initialized", server=self.server_url)
-            except Exception as e:
-                logger.error("jira_client_init_failed", error=str(e))
-                raise ValueError(f"Failed to connect to Jira: {str(e)}")
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get or create the pooled HTTP client."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.server_url,
+                auth=(self.email, self.api_token),
+                headers={"Accept": "application/json"},
+                timeout=_REQUEST_TIMEOUT,
+                limits=_POOL_LIMITS,
+            )
+            logger.info("jira_client_initialized", server=self.server_url)
         return self._client
 
-    def create_ticket(
+    async def _request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        """Issue a request, retrying on 429 with Retry-After/backoff."""
+        client = self._get_client()
+        for attempt in range(_MAX_RATE_LIMIT_RETRIES + 1):
+            response = await client.request(method, path, **kwargs)
+            if response.status_code != 429 or attempt == _MAX_RATE_LIMIT_RETRIES:
+                return response
+            retry_after = response.headers.get("Retry-After")
+            try:
+                delay = float(retry_after)
+            except (TypeError, ValueError):
+                delay = _BACKOFF_BASE_SECONDS * (2 ** attempt)
+            logger.warning(
+                "jira_rate_limited",
+                path=path,
+                retry_in_seconds=delay,
+                attempt=attempt + 1,
+            )
+            await asyncio.sleep(delay)
+        return response
+
+    async def create_ticket(
         self,
         project_key: str,
         summary: str,
@@ -55,49 +93,49 @@ class JiraClient:
     ) -> Dict[str, str]:
         """
         Create a Jira ticket.
-        
+
         Args:
             project_key: Project key (e.g., "PROJ")
             summary: Ticket summary/title
             description: Ticket description
             issue_type: Issue type (Task, Bug, Story, etc.)
             **kwargs: Additional fields (assignee, priority, labels, etc.)
-        
+
         Returns:
             Dict with ticket_key and ticket_url
         """
         try:
-            client = self._get_client()
-            
-            # Build issue dict
+            # Build issue dict (v2 API keeps plain-text descriptions)
             issue_dict = {
                 "project": {"key": project_key},
                 "summary": summary,
                 "description": description,
                 "issuetype": {"name": issue_type},
             }
-            
+
             # Add any additional fields
             issue_dict.update(kwargs)
-            
-            # Create issue
-            new_issue = client.create_issue(fields=issue_dict)
-            
-            ticket_key = new_issue.key
+
+            response = await self._request(
+                "POST", "/rest/api/2/issue", json={"fields": issue_dict}
+            )
+            response.raise_for_status()
+
+            ticket_key = response.json()["key"]
             ticket_url = f"{self.server_url}/browse/{ticket_key}"
-            
+
             logger.info(
                 "jira_ticket_created",
                 ticket_key=ticket_key,
                 project_key=project_key,
             )
-            
+
             return {
                 "ticket_key": ticket_key,
                 "ticket_url": ticket_url,
             }
-            
-        except JIRAError as e:
+
+        except httpx.HTTPError as e:
             logger.error(
                 "jira_ticket_creation_failed",
                 error=str(e),
@@ -108,13 +146,129 @@ class JiraClient:
             logger.error("jira_unexpected_error", error=str(e))
             raise
 
-    def test_connection(self) -> bool:
+    async def create_tickets(
+        self,
+        issues: list,
+        chunk_size: int = 25,
+    ) -> Dict[str, list]:
+        """
+        Create many tickets through Jira's bulk endpoint.
+
+        One bulk POST carries up to chunk_size issues, so N tickets cost
+        ceil(N / 25) round-trips instead of N. Per-issue failures are
+        logged and collected without aborting the rest of the batch.
+
+        Args:
+            issues: Dicts with the create_ticket fields (project_key,
+                summary, description, optional issue_type)
+
+        Returns:
+            Dict with "created" ({ticket_key, ticket_url} per issue) and
+            "errors" (raw error payloads from Jira)
+        """
+        created: list = []
+        errors: list = []
+        for start in range(0, len(issues), chunk_size):
+            chunk = issues[start:start + chunk_size]
+            issue_updates = [
+                {
+                    "fields": {
+                        "project": {"key": issue["project_key"]},
+                        "summary": issue["summary"],
+                        "description": issue["description"],
+                        "issuetype": {"name": issue.get("issue_type", "Task")},
+                    }
+                }
+                for issue in chunk
+            ]
+            try:
+                response = await self._request(
+                    "POST", "/rest/api/2/issue/bulk", json={"issueUpdates": issue_updates}
+                )
+                response.raise_for_status()
+            except httpx.HTTPError as e:
+                logger.error(
+                    "jira_bulk_create_chunk_failed",
+                    error=str(e),
+                    chunk_start=start,
+                    chunk_size=len(chunk),
+                )
+                errors.append({"chunk_start": start, "error": str(e)})
+                continue
+
+            payload = response.json()
+            for item in payload.get("issues", []):
+                created.append(
+                    {
+                        "ticket_key": item["key"],
+                        "ticket_url": f"{self.server_url}/browse/{item['key']}",
+                    }
+                )
+            for error in payload.get("errors", []):
+                logger.error("jira_bulk_create_issue_failed", detail=error)
+                errors.append(error)
+
+        logger.info(
+            "jira_bulk_create_completed",
+            requested=len(issues),
+            created=len(created),
+            errors=len(errors),
+        )
+        return {"created": created, "errors": errors}
+
+    async def get_myself(self) -> Dict:
+        """Fetch the authenticated user's profile."""
+        response = await self._request("GET", "/rest/api/2/myself")
+        response.raise_for_status()
+        return response.json()
+
+    async def test_connection(self) -> bool:
         """Test connection to Jira."""
         try:
-            client = self._get_client()
-            client.current_user()
+            await self.get_myself()
             return True
         except Exception as e:
             logger.error("jira_connection_test_failed", error=str(e))
             return False
 
+    async def close(self) -> None:
+        """Close the pooled HTTP client."""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+
+
+# Shared clients keyed by identity (server, email): each holds a pooled
+# httpx client, so reusing it skips the TCP+TLS+auth round-trips on every
+# call. Keying by identity rather than the full credential triple means a
+# token rotation replaces the entry in place — the stale client (and its
+# pooled TLS connections) is closed instead of stranded until shutdown.
+_jira_clients: Dict[tuple, "JiraClient"] = {}
+
+
+def get_jira_client(server_url: str, email: str, api_token: str) -> "JiraClient":
+    """Get or create a shared JiraClient for the given credentials."""
+    key = (server_url, email)
+    client = _jira_clients.get(key)
+    if client is not None and client.api_token != api_token:
+        # Credential rotation: evict and close the stale client in the
+        # background (we're always called from request handlers, so a
+        # running loop exists)
+        asyncio.get_running_loop().create_task(client.close())
+        logger.info("jira_client_rotated", server=server_url)
+        client = None
+    if client is None:
+        client = JiraClient(
+            server_url=server_url,
+            email=email,
+            api_token=api_token,
+        )
+        _jira_clients[key] = client
+    return client
+
+
+async def close_jira_clients() -> None:
+    """Close every shared Jira client (call on app shutdown)."""
+    clients = list(_jira_clients.values())
+    _jira_clients.clear()
+    for client in clients:
+        await client.close()
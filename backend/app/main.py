@@ -3,13 +3,15 @@
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 
 from app.api.v1 import auth, tenants, documents, rag, agent, credentials
 from app.api.v1 import eval as eval_router
 from app.core.config import settings
-from app.core.database import engine
+from app.core.database import engine, warm_pool
 from app.core.logging import setup_logging
+from app.integrations.jira_client import close_jira_clients
+from app.services.smtp_pool import smtp_pool
 
 # Set up structured logging
 setup_logging()
@@ -22,8 +24,11 @@ async def lifespan(app: FastAPI):
     print(f"[*] Starting {settings.APP_NAME}")
     print(f"[*] Database: {str(settings.DATABASE_URL).split('@')[-1]}")
     print(f"[*] Environment: {settings.ENVIRONMENT}")
+    await warm_pool()
     yield
     # Shutdown
+    await smtp_pool.close()
+    await close_jira_clients()
     await engine.dispose()
     print("[*] Shutting down")
 
@@ -34,6 +39,7 @@ app = FastAPI(
     description="AI-powered document workspace with RAG and agent capabilities",
     version="0.1.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     docs_url=f"/api/{settings.API_VERSION}/docs",
     redoc_url=f"/api/{settings.API_VERSION}/redoc",
     openapi_url=f"/api/{settings.API_VERSION}/openapi.json",
@@ -53,7 +59,7 @@ app.add_middleware(
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
-    return JSONResponse(
+    return ORJSONResponse(
         content={
             "status": "healthy",
             "service": settings.APP_NAME,
@@ -80,6 +86,8 @@ app.include_router(eval_router.router, prefix=f"/api/{settings.API_VERSION}/eval
 
 
 if __name__ == "__main__":
+    import os
+
     import uvicorn
 
     uvicorn.run(
@@ -87,6 +95,14 @@ if __name__ == "__main__":
         host=settings.HOST,
         port=settings.PORT,
         reload=settings.DEBUG,
+        # uvloop + httptools (bundled with uvicorn[standard]) are pinned
+        # explicitly so a missing extra fails loudly instead of silently
+        # falling back to the slower asyncio loop and h11 parser
+        loop="uvloop",
+        http="httptools",
+        # One worker per core in production; reload mode requires a single
+        # worker process
+        workers=None if settings.DEBUG else os.cpu_count(),
         log_level="info",
     )
 
@@ -1,8 +1,9 @@
 """Document and chunk models for file storage and embeddings."""
 
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Enum, JSON, Index
-from pgvector.sqlalchemy import Vector
+from sqlalchemy import Column, BigInteger, Integer, String, DateTime, ForeignKey, Text, Enum, JSON, Index
+from sqlalchemy.dialects.postgresql import JSONB
+from pgvector.sqlalchemy import HALFVEC
 import enum
 
 from app.core.database import Base
@@ -24,20 +25,34 @@ class Document(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     tenant_id = Column(Integer, ForeignKey("tenants.id"), nullable=False, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     filename = Column(String, nullable=False)
     file_type = Column(String, nullable=False)  # pdf, csv, md, txt, docx
     file_size = Column(Integer)  # bytes
-    status = Column(Enum(DocumentStatus), default=DocumentStatus.PENDING, nullable=False, index=True)
+    # Non-native enum renders as VARCHAR + CHECK instead of a pg ENUM type,
+    # so adding a status is a constraint swap rather than ALTER TYPE
+    status = Column(
+        Enum(DocumentStatus, native_enum=False, length=16),
+        default=DocumentStatus.PENDING,
+        nullable=False,
+    )
     storage_key = Column(String, nullable=False, unique=True)  # S3 key or local path
+    # sha256 of the raw upload bytes; nullable because pre-existing rows
+    # predate deduplication
+    content_hash = Column(String(64), nullable=True)
     error_message = Column(Text, nullable=True)
-    doc_metadata = Column(JSON, default={})  # Renamed from 'metadata' (SQLAlchemy reserved word)
+    doc_metadata = Column(JSON().with_variant(JSONB, "postgresql"), default={})  # Renamed from 'metadata' (SQLAlchemy reserved word)
+    chunk_count = Column(Integer, nullable=False, default=0, server_default='0')  # Maintained by trg_chunks_count trigger
     created_at = Column(DateTime, default=datetime.utcnow, index=True)  # Added index for sorting
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
-    # Composite index for optimized tenant-specific queries with date sorting
+    # Tenant-leading composite indexes: every query filters on tenant_id first,
+    # so single-column user_id/status indexes only added write amplification
     __table_args__ = (
         Index('idx_tenant_created', 'tenant_id', 'created_at'),
+        Index('ix_documents_tenant_user', 'tenant_id', 'user_id'),
+        Index('ix_documents_tenant_status', 'tenant_id', 'status'),
+        Index('ix_documents_tenant_content_hash', 'tenant_id', 'content_hash'),
     )
 
 
@@ -46,10 +61,12 @@ class Chunk(Base):
 
     __tablename__ = "chunks"
 
-    id = Column(Integer, primary_key=True, index=True)
+    # BigInteger: append-heavy table would exhaust INT4 at sustained ingestion.
+    # SQLite variant keeps rowid autoincrement working in the test fixtures.
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, index=True)
     document_id = Column(Integer, ForeignKey("documents.id"), nullable=False, index=True)
     content = Column(Text, nullable=False)
-    embedding = Column(Vector(768))  # Sentence Transformers all-mpnet-base-v2 (768 dims, FREE, LOCAL!)
-    chunk_metadata = Column(JSON, default={})  # page, section, etc. (renamed from 'metadata')
+    embedding = Column(HALFVEC(768))  # all-mpnet-base-v2 (768 dims) stored half-precision: 50% less RAM/bandwidth
+    chunk_metadata = Column(JSON().with_variant(JSONB, "postgresql"), default={})  # page, section, etc. (renamed from 'metadata')
     created_at = Column(DateTime, default=datetime.utcnow)
 
@@ -1,7 +1,8 @@
 """Evaluation and metrics models."""
 
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Float, JSON
+from sqlalchemy import Column, BigInteger, Integer, String, DateTime, ForeignKey, Text, Float, JSON, Index
+from sqlalchemy.dialects.postgresql import JSONB
 
 from app.core.database import Base
 
@@ -11,16 +12,23 @@ class EvaluationRun(Base):
 
     __tablename__ = "evaluation_runs"
 
-    id = Column(Integer, primary_key=True, index=True)
+    # BigInteger: one row per RAG query adds up; the SQLite variant keeps
+    # rowid autoincrement working in the test fixtures
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, index=True)
     tenant_id = Column(Integer, ForeignKey("tenants.id"), nullable=False, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     query = Column(Text, nullable=False)
     response = Column(Text, nullable=False)
-    sources = Column(JSON, default=[])  # List of retrieved chunks
+    sources = Column(JSON().with_variant(JSONB, "postgresql"), default=[])  # List of retrieved chunks
     latency_ms = Column(Float)
     token_count = Column(Integer)
     quality_score = Column(Float, nullable=True)  # LLM-as-judge score
     user_feedback = Column(String, nullable=True)  # thumbs_up, thumbs_down
-    eval_metadata = Column(JSON, default={})  # Renamed from 'metadata' (SQLAlchemy reserved word)
+    eval_metadata = Column(JSON().with_variant(JSONB, "postgresql"), default={})  # Renamed from 'metadata' (SQLAlchemy reserved word)
     created_at = Column(DateTime, default=datetime.utcnow, index=True)
 
+    # Dashboards list runs per tenant by recency
+    __table_args__ = (
+        Index('ix_evaluation_runs_tenant_created', 'tenant_id', 'created_at'),
+    )
+
@@ -41,6 +41,13 @@ class UserTenant(Base):
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     tenant_id = Column(Integer, ForeignKey("tenants.id"), nullable=False, index=True)
-    role = Column(Enum(RoleEnum), default=RoleEnum.MEMBER, nullable=False)
+    # Non-native enum renders as VARCHAR + CHECK: no pg_type catalog lookup
+    # per query plan, and adding a role is a cheap constraint swap instead
+    # of ALTER TYPE
+    role = Column(
+        Enum(RoleEnum, native_enum=False, length=16),
+        default=RoleEnum.MEMBER,
+        nullable=False,
+    )
     created_at = Column(DateTime, default=datetime.utcnow)
 
@@ -1,7 +1,7 @@
 """Tenant integration credentials model with encryption."""
 
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, JSON
+from sqlalchemy import Column, Enum, Integer, String, DateTime, ForeignKey, Text, JSON
 from sqlalchemy.orm import relationship
 
 from app.core.database import Base
@@ -15,8 +15,13 @@ class TenantCredentials(Base):
     id = Column(Integer, primary_key=True, index=True)
     tenant_id = Column(Integer, ForeignKey("tenants.id"), nullable=False, index=True)
     
-    # Integration type: "jira", "email", "slack", etc.
-    integration_type = Column(String, nullable=False, index=True)
+    # Integration type; mirrors the native enum the 20241216 migration
+    # created (values stored lowercase, as the app passes them)
+    integration_type = Column(
+        Enum("jira", "email", "slack", name="integration_type_enum"),
+        nullable=False,
+        index=True,
+    )
     
     # Encrypted credentials stored as JSON
     # Structure: {"encrypted_data": "...", "key_id": "..."}
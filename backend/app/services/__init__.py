@@ -1,13 +1,24 @@
 """Service layer for business logic."""
 
-from app.services.answer_engine import AnswerEngineService
-from app.services.retriever import RetrieverService
-from app.services.ingestion import IngestionService
-from app.services.storage import StorageService
-
-__all__ = [
-    "AnswerEngineService",
-    "RetrieverService",
-    "IngestionService",
-    "StorageService",
-]
+import importlib
+
+# Submodule for each exported service class. Resolved lazily (PEP 562) so
+# importing the package doesn't drag in sentence-transformers and the
+# LangChain stack for callers that only need one lightweight service.
+_SERVICE_MODULES = {
+    "AnswerEngineService": "app.services.answer_engine",
+    "RetrieverService": "app.services.retriever",
+    "IngestionService": "app.services.ingestion",
+    "StorageService": "app.services.storage",
+}
+
+__all__ = list(_SERVICE_MODULES)
+
+
+def __getattr__(name):
+    """Resolve service classes on first attribute access."""
+    try:
+        module_name = _SERVICE_MODULES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module_name), name)
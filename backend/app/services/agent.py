@@ -1,6 +1,6 @@
 """LangChain agent service with tools."""
 
-from typing import List, Dict, Optional, Callable, Awaitable
+from typing import AsyncIterator, List, Dict, Optional, Callable, Awaitable
 from langchain.agents import AgentExecutor, create_openai_functions_agent
 from langchain_openai import ChatOpenAI
 from langchain_google_genai import ChatGoogleGenerativeAI
@@ -34,35 +34,40 @@ class AgentService:
             jira_client_factory: Async function that returns a JiraClient instance
             report_generator: Function to generate reports from documents
         """
-        # Initialize LLM based on provider
-        if settings.LLM_PROVIDER == "groq":
-            self.llm = ChatOpenAI(
-                model=settings.LLM_MODEL,
-                api_key=settings.GROQ_API_KEY,
-                base_url="https://api.groq.com/openai/v1",
-                temperature=0.7,
-            )
-        elif settings.LLM_PROVIDER == "gemini":
-            self.llm = ChatGoogleGenerativeAI(
-                model=settings.LLM_MODEL,
-                google_api_key=settings.GOOGLE_API_KEY,
-                temperature=0.7,
-                convert_system_message_to_human=True,
-            )
-        else:  # openai
-            self.llm = ChatOpenAI(
-                model=settings.LLM_MODEL,
-                api_key=settings.OPENAI_API_KEY,
-                temperature=0.7,
-            )
-        
+        self._llm = None
         self.jira_client_factory = jira_client_factory
         self.report_generator = report_generator
         self._agent_executor: Optional[AgentExecutor] = None
 
     def _get_llm(self):
-        """Get LLM instance."""
-        return self.llm
+        """Get or create the LLM client, memoized for the process lifetime.
+
+        Building the client once keeps its underlying HTTP connection pool
+        warm across requests. Construction is synchronous, so no lock is
+        needed on the single event loop.
+        """
+        if self._llm is None:
+            if settings.LLM_PROVIDER == "groq":
+                self._llm = ChatOpenAI(
+                    model=settings.LLM_MODEL,
+                    api_key=settings.GROQ_API_KEY,
+                    base_url="https://api.groq.com/openai/v1",
+                    temperature=0.7,
+                )
+            elif settings.LLM_PROVIDER == "gemini":
+                self._llm = ChatGoogleGenerativeAI(
+                    model=settings.LLM_MODEL,
+                    google_api_key=settings.GOOGLE_API_KEY,
+                    temperature=0.7,
+                    convert_system_message_to_human=True,
+                )
+            else:  # openai
+                self._llm = ChatOpenAI(
+                    model=settings.LLM_MODEL,
+                    api_key=settings.OPENAI_API_KEY,
+                    temperature=0.7,
+                )
+        return self._llm
     
     def _get_tools(self) -> List[Tool]:
         """Get list of LangChain tools for the agent."""
@@ -103,7 +108,7 @@ Use the tools when appropriate to help the user accomplish their tasks. Always e
             # Note: Gemini doesn't support function calling in the same way, so we'll use a simpler approach
             if settings.LLM_PROVIDER == "openai" and len(tools) > 0:
                 try:
-                    agent = create_openai_functions_agent(self.llm, tools, prompt)
+                    agent = create_openai_functions_agent(self._get_llm(), tools, prompt)
                     # Create executor
                     self._agent_executor = AgentExecutor(
                         agent=agent,
@@ -233,3 +238,50 @@ Example format:
             logger.error("email_draft_failed", error=str(e))
             raise ValueError(f"Failed to generate email draft: {str(e)}")
 
+    async def generate_email_draft_stream(
+        self,
+        context: str,
+        recipient: Optional[str] = None,
+        tone: str = "professional",
+    ) -> AsyncIterator[str]:
+        """
+        Stream an email draft token-by-token.
+
+        Unlike generate_email_draft, this yields plain text (subject line first,
+        then body) so clients see first tokens immediately instead of waiting
+        for the full JSON response.
+
+        Args:
+            context: Context or topic for the email
+            recipient: Optional recipient email/name
+            tone: Email tone (professional, casual, formal, friendly)
+
+        Yields:
+            Response text tokens
+        """
+        recipient_text = f"Recipient: {recipient}\n" if recipient else ""
+
+        prompt = f"""Write a {tone} email based on the following context:
+
+{recipient_text}Context: {context}
+
+Requirements:
+1. Start with a single line "Subject: ..." containing the subject
+2. Follow with a blank line, then the email body
+3. Use a {tone} tone throughout
+4. Make it actionable and professional
+"""
+
+        messages = [
+            SystemMessage(content="You are an expert email writer."),
+            HumanMessage(content=prompt),
+        ]
+
+        try:
+            async for chunk in self._get_llm().astream(messages):
+                if chunk.content:
+                    yield chunk.content
+        except Exception as e:
+            logger.error("email_draft_stream_failed", error=str(e))
+            raise ValueError(f"Failed to stream email draft: {str(e)}")
+
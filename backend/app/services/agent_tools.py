@@ -82,7 +82,7 @@ def create_jira_ticket_tool(jira_client_factory) -> Tool:
             else:
                 return "Jira client factory not available."
             
-            result = jira_client.create_ticket(
+            result = await jira_client.create_ticket(
                 project_key=project_key,
                 summary=summary,
                 description=description,
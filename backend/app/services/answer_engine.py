@@ -1,15 +1,38 @@
 """Professional answer engine service for RAG responses."""
 
+import re
 from typing import List, Dict
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_openai import ChatOpenAI
-from langchain.schema import HumanMessage, SystemMessage
 
 from app.core.config import settings
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Conversational patterns fused into a single anchored alternation and
+# compiled once at import, instead of four re.match calls per invocation.
+# The named groups double as intent buckets so callers can pick a canned
+# response without a second classification pass. Alternatives are ordered
+# longest-first within each group so the scan commits early.
+_CONVERSATIONAL_RE = re.compile(
+    r'^(?:'
+    r'(?P<greeting>(?:good morning|good afternoon|good evening|greetings|howdy|hello|hey|hi)[\s!.,]*)'
+    r'|(?P<smalltalk>(?:how are you|what\'?s up|how\'?s it going|how do you do)[\s?]*)'
+    r'|(?P<thanks>(?:thank you|thanks|thx|appreciate it)[\s!.,]*)'
+    r'|(?P<help>(?:what can you do|who are you|what are you|help me|help)[\s?]*)'
+    r')$'
+)
+
+_QUESTION_WORDS = ('?', 'what', 'who', 'when', 'where', 'why', 'how', 'which')
+
+# Static answers for conversational queries, keyed by intent bucket.
+# Serving these from the endpoint skips retrieval and the LLM entirely.
+CANNED_RESPONSES = {
+    "greeting": "Hello! I'm here to help you find information from your uploaded documents. Feel free to ask me questions about the content in your documents, and I'll provide answers with citations.",
+    "thanks": "You're welcome! I'm happy to help. If you have any questions about your documents, just ask!",
+    "help": "I'm an AI assistant that helps you find information from your uploaded documents. You can ask me questions about the content in your documents, and I'll search through them to provide accurate answers with source citations. Try asking something like 'What is mentioned about X?' or 'Summarize the key points from the documents.'",
+    "default": "I'm here to help you find information from your uploaded documents. Feel free to ask me questions about the content in your documents!",
+}
+
 
 class AnswerEngineService:
     """
@@ -106,10 +129,17 @@ Remember: Be COMPLETE, cite from multiple sources, use LaTeX for all math, cover
     def __init__(self):
         """Initialize the answer engine with LLM."""
         self.llm = None
+        self.llm_stream = None
 
     def _get_llm(self):
         """Get or create LLM instance."""
         if not self.llm:
+            # Provider clients are imported here, not at module top: each
+            # pulls in a heavy SDK (grpc for Gemini, httpx machinery for
+            # OpenAI) that workers shouldn't pay for at import time
+            from langchain_google_genai import ChatGoogleGenerativeAI
+            from langchain_openai import ChatOpenAI
+
             if settings.LLM_PROVIDER == "groq":
                 self.llm = ChatOpenAI(
                     model=settings.LLM_MODEL,
@@ -131,37 +161,63 @@ Remember: Be COMPLETE, cite from multiple sources, use LaTeX for all math, cover
                 )
         return self.llm
 
-    def _is_conversational_query(self, query: str) -> bool:
+    def _get_llm_stream(self):
+        """Get or create the streaming LLM instance.
+
+        Built once and reused: constructing a client per request redid
+        auth and transport setup on every streamed answer.
+        """
+        if not self.llm_stream:
+            from langchain_google_genai import ChatGoogleGenerativeAI
+            from langchain_openai import ChatOpenAI
+
+            if settings.LLM_PROVIDER == "groq":
+                self.llm_stream = ChatOpenAI(
+                    model=settings.LLM_MODEL,
+                    api_key=settings.GROQ_API_KEY,
+                    base_url="https://api.groq.com/openai/v1",
+                    temperature=0.5,
+                    streaming=True,
+                )
+            elif settings.LLM_PROVIDER == "openai":
+                self.llm_stream = ChatOpenAI(
+                    model=settings.LLM_MODEL,
+                    api_key=settings.OPENAI_API_KEY,
+                    temperature=0.5,
+                    streaming=True,
+                )
+            else:
+                self.llm_stream = ChatGoogleGenerativeAI(
+                    model=settings.LLM_MODEL,
+                    google_api_key=settings.GOOGLE_API_KEY,
+                    temperature=0.5,
+                    streaming=True,
+                )
+        return self.llm_stream
+
+    def _is_conversational_query(self, query: str) -> str | None:
         """
         Detect if query is conversational/generic (greetings, small talk, etc.).
-        
-        Returns True if query should be answered conversationally without document retrieval.
+
+        Returns the intent bucket ("greeting", "smalltalk", "thanks", "help",
+        "short") if the query should be answered without document retrieval,
+        None otherwise. The bucket indexes into CANNED_RESPONSES; truthiness
+        matches the old boolean contract for existing callers.
         """
-        query_lower = query.lower().strip()
-        
-        # Common conversational patterns
-        conversational_patterns = [
-            # Greetings
-            r'^(hi|hello|hey|greetings|good morning|good afternoon|good evening|howdy)[\s!.,]*$',
-            # Small talk
-            r'^(how are you|what\'?s up|how\'?s it going|how do you do)[\s?]*$',
-            # Generic thanks
-            r'^(thanks|thank you|thx|appreciate it)[\s!.,]*$',
-            # Generic questions
-            r'^(what can you do|who are you|what are you|help|help me)[\s?]*$',
-        ]
-        
-        import re
-        for pattern in conversational_patterns:
-            if re.match(pattern, query_lower):
-                return True
-        
+        # Conversational queries are short by nature; capping the scanned
+        # prefix bounds the regex cost for pathological long inputs
+        query_lower = query.lower().strip()[:64]
+
+        match = _CONVERSATIONAL_RE.match(query_lower)
+        if match:
+            return match.lastgroup
+
         # Very short queries (1-2 words) that aren't questions
         words = query_lower.split()
-        if len(words) <= 2 and not any(q in query_lower for q in ['?', 'what', 'who', 'when', 'where', 'why', 'how', 'which']):
-            return True
-        
-        return False
+        if len(words) <= 2 and not any(q in query_lower for q in _QUESTION_WORDS):
+            return "short"
+
+        return None
 
     def _chunks_are_relevant(self, chunks: List[Dict], min_score: float = 0.4) -> bool:
         """
@@ -239,6 +295,8 @@ User Question: {query}
 Provide a professional, well-structured answer using the format specified in your instructions. Remember to cite sources with [1], [2], etc. when using information from the context."""
 
             # Generate answer
+            from langchain.schema import HumanMessage, SystemMessage
+
             llm = self._get_llm()
             messages = [
                 SystemMessage(content=self.SYSTEM_PROMPT),
@@ -274,22 +332,8 @@ Provide a professional, well-structured answer using the format specified in you
         Returns:
             Friendly, conversational response
         """
-        query_lower = query.lower().strip()
-        
-        # Greeting responses
-        if any(greeting in query_lower for greeting in ['hi', 'hello', 'hey', 'greetings', 'howdy']):
-            return "Hello! I'm here to help you find information from your uploaded documents. Feel free to ask me questions about the content in your documents, and I'll provide answers with citations."
-        
-        # Thanks responses
-        if any(thanks in query_lower for thanks in ['thanks', 'thank you', 'thx', 'appreciate']):
-            return "You're welcome! I'm happy to help. If you have any questions about your documents, just ask!"
-        
-        # Help/general questions
-        if any(help_word in query_lower for help_word in ['help', 'what can you do', 'who are you', 'what are you']):
-            return "I'm an AI assistant that helps you find information from your uploaded documents. You can ask me questions about the content in your documents, and I'll search through them to provide accurate answers with source citations. Try asking something like 'What is mentioned about X?' or 'Summarize the key points from the documents.'"
-        
-        # Default conversational response
-        return "I'm here to help you find information from your uploaded documents. Feel free to ask me questions about the content in your documents!"
+        bucket = self._is_conversational_query(query)
+        return CANNED_RESPONSES.get(bucket, CANNED_RESPONSES["default"])
 
     def _clean_answer(self, answer: str) -> str:
         """
@@ -362,30 +406,11 @@ User Question: {query}
 
 Provide a professional, well-structured answer using the format specified in your instructions. Remember to cite sources with [1], [2], etc. when using information from the context."""
 
-            # Stream answer
-            if settings.LLM_PROVIDER == "groq":
-                llm = ChatOpenAI(
-                    model=settings.LLM_MODEL,
-                    api_key=settings.GROQ_API_KEY,
-                    base_url="https://api.groq.com/openai/v1",
-                    temperature=0.5,
-                    streaming=True,
-                )
-            elif settings.LLM_PROVIDER == "openai":
-                llm = ChatOpenAI(
-                    model=settings.LLM_MODEL,
-                    api_key=settings.OPENAI_API_KEY,
-                    temperature=0.5,
-                    streaming=True,
-                )
-            else:
-                llm = ChatGoogleGenerativeAI(
-                    model=settings.LLM_MODEL,
-                    google_api_key=settings.GOOGLE_API_KEY,
-                    temperature=0.5,
-                    streaming=True,
-                )
-            
+            # Stream answer through the shared streaming client
+            from langchain.schema import HumanMessage, SystemMessage
+
+            llm = self._get_llm_stream()
+
             messages = [
                 SystemMessage(content=self.SYSTEM_PROMPT),
                 HumanMessage(content=user_prompt),
@@ -1,6 +1,8 @@
 """Service for managing tenant integration credentials."""
 
-from typing import Dict, Any, Optional
+import asyncio
+import time
+from typing import Dict, Any, Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
@@ -10,13 +12,25 @@ from app.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+# How long decrypted credentials stay cached in-process. Short enough that
+# out-of-band changes converge quickly; in-process writes invalidate directly.
+_CACHE_TTL_SECONDS = 60
+
 
 class CredentialsService:
     """Service for managing encrypted tenant credentials."""
-    
+
     def __init__(self):
         self.encryption = get_encryption()
-    
+        # Decrypted credentials keyed by (tenant_id, integration_type) so a
+        # burst of agent calls pays the DB round-trip + decrypt only once
+        self._cache: Dict[Tuple[int, str], Tuple[float, Optional[Dict[str, Any]]]] = {}
+        self._cache_locks: Dict[Tuple[int, str], asyncio.Lock] = {}
+
+    def _invalidate(self, tenant_id: int, integration_type: str) -> None:
+        """Drop a cached entry after its credentials change."""
+        self._cache.pop((tenant_id, integration_type), None)
+
     async def get_credentials(
         self,
         db: AsyncSession,
@@ -25,41 +39,60 @@ class CredentialsService:
     ) -> Optional[Dict[str, Any]]:
         """
         Get decrypted credentials for a tenant integration.
-        
+
+        Results are cached in-process for a short TTL; a per-key lock keeps
+        concurrent cache misses from stampeding the DB and crypto.
+
         Args:
             db: Database session
             tenant_id: Tenant ID
             integration_type: Integration type ("jira", "email", etc.)
-            
+
         Returns:
             Decrypted credentials dict or None if not found
         """
-        try:
-            result = await db.execute(
-                select(TenantCredentials)
-                .where(
-                    TenantCredentials.tenant_id == tenant_id,
-                    TenantCredentials.integration_type == integration_type,
-                    TenantCredentials.is_active == "active",
+        key = (tenant_id, integration_type)
+        cached = self._cache.get(key)
+        if cached and time.monotonic() < cached[0]:
+            return cached[1]
+
+        lock = self._cache_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            # Another coroutine may have refreshed the entry while we waited
+            cached = self._cache.get(key)
+            if cached and time.monotonic() < cached[0]:
+                return cached[1]
+
+            try:
+                result = await db.execute(
+                    select(TenantCredentials)
+                    .where(
+                        TenantCredentials.tenant_id == tenant_id,
+                        TenantCredentials.integration_type == integration_type,
+                        TenantCredentials.is_active == "active",
+                    )
+                )
+                cred = result.scalar_one_or_none()
+
+                if cred:
+                    # Decrypt credentials
+                    decrypted = self.encryption.decrypt(cred.encrypted_credentials["encrypted_data"])
+                else:
+                    # Cache the miss too; saves invalidate, so new credentials
+                    # are picked up immediately
+                    decrypted = None
+
+                self._cache[key] = (time.monotonic() + _CACHE_TTL_SECONDS, decrypted)
+                return decrypted
+
+            except Exception as e:
+                logger.error(
+                    "get_credentials_failed",
+                    tenant_id=tenant_id,
+                    integration_type=integration_type,
+                    error=str(e),
                 )
-            )
-            cred = result.scalar_one_or_none()
-            
-            if not cred:
                 return None
-            
-            # Decrypt credentials
-            decrypted = self.encryption.decrypt(cred.encrypted_credentials["encrypted_data"])
-            return decrypted
-            
-        except Exception as e:
-            logger.error(
-                "get_credentials_failed",
-                tenant_id=tenant_id,
-                integration_type=integration_type,
-                error=str(e),
-            )
-            return None
     
     async def save_credentials(
         self,
@@ -104,6 +137,7 @@ class CredentialsService:
                 existing.is_active = "active"
                 await db.commit()
                 await db.refresh(existing)
+                self._invalidate(tenant_id, integration_type)
                 return existing
             else:
                 # Create new
@@ -117,6 +151,7 @@ class CredentialsService:
                 db.add(new_cred)
                 await db.commit()
                 await db.refresh(new_cred)
+                self._invalidate(tenant_id, integration_type)
                 return new_cred
                 
         except Exception as e:
@@ -161,6 +196,7 @@ class CredentialsService:
             
             await db.delete(cred)
             await db.commit()
+            self._invalidate(tenant_id, integration_type)
             return True
             
         except Exception as e:
@@ -1,5 +1,6 @@
 """Document ingestion and processing service."""
 
+import asyncio
 from pathlib import Path
 from typing import BinaryIO, List, Dict
 import PyPDF2
@@ -7,7 +8,7 @@ import pandas as pd
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from sentence_transformers import SentenceTransformer
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import insert, select
 
 from app.core.config import settings
 from app.core.logging import get_logger
@@ -124,13 +125,36 @@ class IngestionService:
             # Generate embedding locally (no API call!)
             # Note: This is synchronous but fast (~50ms)
             embedding = self.embeddings.encode(text, convert_to_tensor=False)
-            
+
             # Convert to list and return (384 dimensions)
             return embedding.tolist()
         except Exception as e:
             logger.error("embedding_generation_failed", error=str(e), provider="local")
             raise
 
+    async def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Batch-encode many texts in one model pass.
+
+        The transformer vectorizes over the whole batch, so encoding N
+        chunks together is far cheaper than N single-text calls; the
+        encode runs in a worker thread to keep the event loop free.
+        """
+        if not self.embeddings:
+            raise ValueError("Embedding model not loaded")
+
+        truncated = [text[:5000] for text in texts]
+        try:
+            vectors = await asyncio.to_thread(
+                self.embeddings.encode,
+                truncated,
+                batch_size=32,
+                convert_to_tensor=False,
+            )
+            return [vector.tolist() for vector in vectors]
+        except Exception as e:
+            logger.error("batch_embedding_generation_failed", error=str(e), provider="local")
+            raise
+
     async def process_document(
         self, 
         db: AsyncSession,
@@ -173,38 +197,31 @@ class IngestionService:
             
             logger.info("document_chunked", document_id=document_id, chunks=len(chunk_data_list))
             
-            # 3. Generate embeddings and store chunks
-            for idx, chunk_data in enumerate(chunk_data_list):
-                try:
-                    # Generate embedding
-                    embedding = await self.generate_embedding(chunk_data["content"])
-                    
-                    # Store chunk with embedding
-                    chunk = Chunk(
-                        document_id=document_id,
-                        content=chunk_data["content"],
-                        embedding=embedding,
-                        chunk_metadata={
-                            **chunk_data["metadata"],
-                            "chunk_index": idx,
-                            "chunk_size": len(chunk_data["content"]),
-                        },
-                    )
-                    db.add(chunk)
-                    
-                    # Commit in batches of 10 for performance
-                    if (idx + 1) % 10 == 0:
-                        await db.commit()
-                        logger.info("chunks_batch_saved", document_id=document_id, batch=idx+1)
-                
-                except Exception as e:
-                    logger.error("chunk_processing_failed", document_id=document_id, chunk_index=idx, error=str(e))
-                    # Continue with other chunks
-                    continue
-            
-            # Final commit
+            # 3. Generate embeddings in one batched model pass, then insert
+            # every chunk with a single bulk statement — one round-trip
+            # family via executemany instead of an ORM flush per row
+            embeddings = await self.generate_embeddings(
+                [chunk_data["content"] for chunk_data in chunk_data_list]
+            )
+
+            rows = [
+                {
+                    "document_id": document_id,
+                    "content": chunk_data["content"],
+                    "embedding": embedding,
+                    "chunk_metadata": {
+                        **chunk_data["metadata"],
+                        "chunk_index": idx,
+                        "chunk_size": len(chunk_data["content"]),
+                    },
+                }
+                for idx, (chunk_data, embedding) in enumerate(
+                    zip(chunk_data_list, embeddings)
+                )
+            ]
+            await db.execute(insert(Chunk), rows)
             await db.commit()
-            
+
             # 4. Update document status to completed
             document.status = DocumentStatus.COMPLETED
             await db.commit()
@@ -0,0 +1,132 @@
+"""In-process semantic cache for RAG retrieval results.
+
+Duplicate and near-duplicate questions are common (re-asks, rephrasings,
+multiple users on the same document set). A hit here skips the entire
+retrieval pipeline — query expansion, embedding, pgvector ANN search,
+BM25 and re-ranking — and returns the previously retrieved chunks.
+
+Two layers, both tenant-scoped and keyed on the document filter:
+- exact: normalized query string lookup, no embedding needed
+- semantic: cosine similarity against cached query embeddings; entries
+  are few and short-lived, so a brute-force numpy dot product beats the
+  bookkeeping cost of a dedicated ANN index
+
+Entries expire by TTL (which also bounds staleness after re-ingestion)
+and each tenant's list is capped, oldest-first.
+"""
+
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class SemanticCache:
+    """TTL + count bounded cache of retrieval results per tenant."""
+
+    TTL_SECONDS = 300
+    MAX_ENTRIES_PER_TENANT = 256
+    SIMILARITY_THRESHOLD = 0.97
+
+    def __init__(self):
+        # tenant_id -> list of (timestamp, doc_filter, unit embedding, chunks)
+        self._entries: Dict[int, List[Tuple[float, tuple, np.ndarray, List[Dict]]]] = {}
+        # (tenant_id, doc_filter, normalized query) -> (timestamp, chunks)
+        self._exact: Dict[Tuple[int, tuple, str], Tuple[float, List[Dict]]] = {}
+
+    @staticmethod
+    def _doc_filter(document_ids: List[int] | None) -> tuple:
+        return tuple(sorted(document_ids)) if document_ids else ()
+
+    @staticmethod
+    def _normalize_query(query: str) -> str:
+        return " ".join(query.lower().split())
+
+    def lookup_exact(
+        self, tenant_id: int, query: str, document_ids: List[int] | None = None
+    ) -> Optional[List[Dict]]:
+        """Return cached chunks for a textually identical query, if fresh."""
+        key = (tenant_id, self._doc_filter(document_ids), self._normalize_query(query))
+        cached = self._exact.get(key)
+        if cached is None:
+            return None
+        cached_at, chunks = cached
+        if time.time() - cached_at >= self.TTL_SECONDS:
+            self._exact.pop(key, None)
+            return None
+        return list(chunks)
+
+    def lookup(
+        self,
+        tenant_id: int,
+        query_embedding: List[float],
+        document_ids: List[int] | None = None,
+    ) -> Optional[List[Dict]]:
+        """Return cached chunks for a semantically near-identical query."""
+        entries = self._entries.get(tenant_id)
+        if not entries:
+            return None
+
+        now = time.time()
+        doc_filter = self._doc_filter(document_ids)
+        fresh = [e for e in entries if now - e[0] < self.TTL_SECONDS]
+        if len(fresh) != len(entries):
+            self._entries[tenant_id] = fresh
+        candidates = [e for e in fresh if e[1] == doc_filter]
+        if not candidates:
+            return None
+
+        query_vec = np.asarray(query_embedding, dtype=np.float32)
+        norm = np.linalg.norm(query_vec)
+        if norm == 0:
+            return None
+        query_vec /= norm
+
+        # One matmul over all cached unit vectors for this tenant/filter
+        matrix = np.stack([e[2] for e in candidates])
+        similarities = matrix @ query_vec
+        best = int(np.argmax(similarities))
+        if similarities[best] >= self.SIMILARITY_THRESHOLD:
+            logger.info(
+                "semantic_cache_hit",
+                tenant_id=tenant_id,
+                similarity=float(similarities[best]),
+            )
+            return list(candidates[best][3])
+        return None
+
+    def insert(
+        self,
+        tenant_id: int,
+        query: str,
+        query_embedding: List[float],
+        chunks: List[Dict],
+        document_ids: List[int] | None = None,
+    ) -> None:
+        """Cache a retrieval result under both the exact and semantic keys."""
+        now = time.time()
+        doc_filter = self._doc_filter(document_ids)
+        self._exact[(tenant_id, doc_filter, self._normalize_query(query))] = (now, chunks)
+
+        vec = np.asarray(query_embedding, dtype=np.float32)
+        norm = np.linalg.norm(vec)
+        if norm == 0:
+            return
+        entries = self._entries.setdefault(tenant_id, [])
+        entries.append((now, doc_filter, vec / norm, chunks))
+        if len(entries) > self.MAX_ENTRIES_PER_TENANT:
+            del entries[: len(entries) - self.MAX_ENTRIES_PER_TENANT]
+
+    def invalidate(self, tenant_id: int) -> None:
+        """Drop every cached result for a tenant (e.g. after re-ingestion)."""
+        self._entries.pop(tenant_id, None)
+        for key in [k for k in self._exact if k[0] == tenant_id]:
+            self._exact.pop(key, None)
+
+
+# Singleton instance
+query_cache = SemanticCache()
@@ -0,0 +1,143 @@
+"""Micro-batcher that coalesces concurrent report LLM calls.
+
+When several `/generate-report` requests arrive together, each pays the
+full per-call LLM overhead (connection, preamble tokens, scheduling).
+The batcher collects prompts arriving within a short window and submits
+them as one enumerated LLM call, then splits the response back out to
+the waiting requests. Disabled by default (ENABLE_REPORT_BATCHING) since
+it trades a little per-request latency for throughput.
+"""
+
+import asyncio
+import re
+from typing import List, Tuple
+
+from langchain.schema import HumanMessage, SystemMessage
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# How long the first request in a batch waits for company, and how many
+# prompts a single batched call may carry
+BATCH_WINDOW_MS = 250
+MAX_BATCH_SIZE = 4
+
+_SECTION_RE = re.compile(r"^=== REPORT (\d+) ===\s*$", re.MULTILINE)
+
+_BATCH_HEADER = """You will be given {n} independent report requests. Answer each one completely and independently.
+
+Precede each answer with a line containing exactly:
+=== REPORT <number> ===
+
+using the request's number. Do not add any other text between reports."""
+
+
+class ReportBatcher:
+    """Coalesces report prompts into batched LLM calls."""
+
+    def __init__(
+        self,
+        batch_window_ms: int = BATCH_WINDOW_MS,
+        max_batch: int = MAX_BATCH_SIZE,
+    ):
+        self.batch_window = batch_window_ms / 1000.0
+        self.max_batch = max_batch
+        self._pending: List[Tuple[object, str, str, asyncio.Future]] = []
+        self._lock = asyncio.Lock()
+        self._flush_handle: asyncio.TimerHandle | None = None
+
+    async def generate(self, llm, system_prompt: str, prompt: str) -> str:
+        """Submit a prompt and wait for its (possibly batched) completion."""
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future = loop.create_future()
+
+        async with self._lock:
+            self._pending.append((llm, system_prompt, prompt, future))
+            if len(self._pending) >= self.max_batch:
+                batch = self._drain()
+                asyncio.ensure_future(self._run_batch(batch))
+            elif len(self._pending) == 1:
+                # First prompt in a window: schedule the flush
+                loop.call_later(
+                    self.batch_window,
+                    lambda: asyncio.ensure_future(self._flush()),
+                )
+
+        return await future
+
+    def _drain(self) -> List[Tuple[object, str, str, asyncio.Future]]:
+        batch = self._pending
+        self._pending = []
+        return batch
+
+    async def _flush(self) -> None:
+        async with self._lock:
+            batch = self._drain()
+        if batch:
+            await self._run_batch(batch)
+
+    async def _run_batch(
+        self, batch: List[Tuple[object, str, str, asyncio.Future]]
+    ) -> None:
+        llm, system_prompt, _, _ = batch[0]
+
+        if len(batch) == 1:
+            await self._run_single(batch[0])
+            return
+
+        numbered = "\n\n".join(
+            f"=== REQUEST {i + 1} ===\n{prompt}"
+            for i, (_, _, prompt, _) in enumerate(batch)
+        )
+        batched_prompt = f"{_BATCH_HEADER.format(n=len(batch))}\n\n{numbered}"
+
+        try:
+            response = await llm.ainvoke([
+                SystemMessage(content=system_prompt),
+                HumanMessage(content=batched_prompt),
+            ])
+            sections = self._split_sections(response.content, len(batch))
+        except Exception as e:
+            logger.warning("report_batch_failed", error=str(e), batch_size=len(batch))
+            sections = None
+
+        if sections is None:
+            # Batched call failed or came back malformed: fall back to one
+            # call per request so nobody gets a mangled report
+            await asyncio.gather(*(self._run_single(item) for item in batch))
+            return
+
+        logger.info("report_batch_completed", batch_size=len(batch))
+        for (_, _, _, future), section in zip(batch, sections):
+            if not future.done():
+                future.set_result(section)
+
+    async def _run_single(
+        self, item: Tuple[object, str, str, asyncio.Future]
+    ) -> None:
+        llm, system_prompt, prompt, future = item
+        try:
+            response = await llm.ainvoke([
+                SystemMessage(content=system_prompt),
+                HumanMessage(content=prompt),
+            ])
+            if not future.done():
+                future.set_result(response.content)
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+
+    @staticmethod
+    def _split_sections(content: str, expected: int) -> List[str] | None:
+        """Split a batched response on its report markers; None if malformed."""
+        parts = _SECTION_RE.split(content)
+        # split() yields [preamble, num, body, num, body, ...]
+        bodies = [parts[i].strip() for i in range(2, len(parts), 2)]
+        if len(bodies) != expected or not all(bodies):
+            return None
+        return bodies
+
+
+# Global batcher instance
+report_batcher = ReportBatcher()
@@ -32,6 +32,10 @@ class RetrieverService:
     HYBRID_ALPHA = 0.7  # Weight for vector search (0.3 for BM25)
     RERANK_TOP_K = 30  # Number of candidates for re-ranking
 
+    # HNSW search parameters (pgvector default ef_search=40 is too low for 768 dims)
+    EF_SEARCH_INTERACTIVE = 100  # Interactive queries: latency-sensitive
+    EF_SEARCH_EVAL = 200  # Eval/bulk runs: recall over latency
+
     def __init__(self):
         # Initialize embedding model
         try:
@@ -61,6 +65,48 @@ class RetrieverService:
             logger.error("query_embedding_failed", error=str(e))
             raise
 
+    async def configure_hnsw_params(self, db: AsyncSession, eval_mode: bool = False) -> int:
+        """
+        Pick an hnsw.ef_search value from the chunks table size.
+
+        Uses the planner's row estimate (reltuples) so this costs a catalog
+        lookup, not a COUNT(*). Small tables don't benefit from a large
+        candidate list; at scale the default of 40 costs too much recall.
+        """
+        base_ef = self.EF_SEARCH_EVAL if eval_mode else self.EF_SEARCH_INTERACTIVE
+        try:
+            result = await db.execute(
+                text("SELECT reltuples::bigint FROM pg_class WHERE relname = 'chunks'")
+            )
+            vector_count = result.scalar() or 0
+            if vector_count < 10_000:
+                return min(base_ef, 60)
+            return base_ef
+        except Exception as e:
+            logger.warning("hnsw_param_lookup_failed", error=str(e))
+            return base_ef
+
+    async def _set_ef_search(self, db: AsyncSession, ef_search: int) -> None:
+        """Scope vector-search tuning to the current transaction (SET LOCAL semantics)."""
+        try:
+            # set_config(..., true) is transaction-local, same as SET LOCAL,
+            # but accepts bind parameters
+            await db.execute(
+                text("SELECT set_config('hnsw.ef_search', :ef, true)"),
+                {"ef": str(ef_search)},
+            )
+            if settings.ENABLE_IVFFLAT_INDEX:
+                # Tune the IVFFlat index too, in case the planner picks it
+                # (bulk scans); default probes=1 checks a single list and
+                # recall collapses. ef/4 tracks the ef tiers: 25 probes
+                # interactive, 50 on eval/bulk runs.
+                await db.execute(
+                    text("SELECT set_config('ivfflat.probes', :probes, true)"),
+                    {"probes": str(max(10, ef_search // 4))},
+                )
+        except Exception as e:
+            logger.warning("set_ef_search_failed", error=str(e))
+
     def _tokenize(self, text: str) -> List[str]:
         """Simple tokenization for BM25."""
         # Lowercase and split on non-alphanumeric
@@ -74,45 +120,47 @@ class RetrieverService:
         tenant_id: int,
         document_ids: List[int] | None = None,
         limit: int = 30,
+        ef_search: int | None = None,
+        min_score: float | None = None,
     ) -> List[Dict]:
-        """Vector similarity search using pgvector."""
+        """Vector similarity search using pgvector.
+
+        When min_score is set, the threshold is applied server-side as a
+        cosine-distance bound, so irrelevant rows never cross the wire.
+        """
         try:
+            # Scope the HNSW candidate-list size to this transaction
+            await self._set_ef_search(db, ef_search or self.EF_SEARCH_INTERACTIVE)
+
             embedding_str = '[' + ','.join(map(str, query_embedding)) + ']'
-            
+            distance_expr = f"c.embedding <=> '{embedding_str}'::halfvec(768)"
+
+            # score = 1 - distance, so score >= min_score <=> distance <= 1 - min_score
+            threshold_clause = ""
+            params = {"tenant_id": tenant_id, "limit": limit}
+            if min_score is not None:
+                threshold_clause = f"AND ({distance_expr}) <= :max_distance"
+                params["max_distance"] = 1.0 - min_score
             if document_ids:
-                query_str = f"""
-                    SELECT 
-                        c.id,
-                        c.content,
-                        c.chunk_metadata,
-                        d.filename,
-                        d.id as document_id,
-                        1 - (c.embedding <=> '{embedding_str}'::vector) as score
-                    FROM chunks c
-                    JOIN documents d ON c.document_id = d.id
-                    WHERE d.tenant_id = :tenant_id
-                    AND d.id = ANY(:document_ids)
-                    ORDER BY score DESC
-                    LIMIT :limit
-                """
-                params = {"tenant_id": tenant_id, "document_ids": document_ids, "limit": limit}
-            else:
-                query_str = f"""
-                    SELECT 
-                        c.id,
-                        c.content,
-                        c.chunk_metadata,
-                        d.filename,
-                        d.id as document_id,
-                        1 - (c.embedding <=> '{embedding_str}'::vector) as score
-                    FROM chunks c
-                    JOIN documents d ON c.document_id = d.id
-                    WHERE d.tenant_id = :tenant_id
-                    ORDER BY score DESC
-                    LIMIT :limit
-                """
-                params = {"tenant_id": tenant_id, "limit": limit}
-            
+                params["document_ids"] = document_ids
+
+            query_str = f"""
+                SELECT
+                    c.id,
+                    c.content,
+                    c.chunk_metadata,
+                    d.filename,
+                    d.id as document_id,
+                    1 - ({distance_expr}) as score
+                FROM chunks c
+                JOIN documents d ON c.document_id = d.id
+                WHERE d.tenant_id = :tenant_id
+                {"AND d.id = ANY(:document_ids)" if document_ids else ""}
+                {threshold_clause}
+                ORDER BY {distance_expr}
+                LIMIT :limit
+            """
+
             result = await db.execute(text(query_str), params)
             rows = result.fetchall()
             
@@ -318,15 +366,24 @@ class RetrieverService:
         use_hybrid: bool = True,
         use_reranking: bool = True,
         use_query_expansion: bool = True,
+        ef_search: int | None = None,
+        relevance_threshold: float | None = None,
     ) -> List[Dict]:
         """
         Advanced retrieval pipeline with:
         1. Multi-query expansion (optional)
         2. Hybrid search: vector + BM25 (optional)
         3. Cross-encoder re-ranking (optional)
-        4. Similarity threshold filtering
+        4. Similarity threshold filtering (pushed into the vector SQL)
         """
         try:
+            if relevance_threshold is None:
+                relevance_threshold = self.MIN_SIMILARITY_THRESHOLD
+
+            # Pick ef_search once per retrieval from the table size
+            if ef_search is None:
+                ef_search = await self.configure_hnsw_params(db)
+
             # Step 1: Generate query variations for completeness
             if use_query_expansion:
                 queries = self._generate_query_variations(query)
@@ -346,6 +403,8 @@ class RetrieverService:
                     tenant_id=tenant_id,
                     document_ids=document_ids,
                     limit=self.RERANK_TOP_K,
+                    ef_search=ef_search,
+                    min_score=relevance_threshold,
                 )
                 
                 if use_hybrid:
@@ -372,8 +431,10 @@ class RetrieverService:
             candidates = list(all_chunks.values())
             candidates.sort(key=lambda x: x["score"], reverse=True)
             
-            # Step 3: Filter by similarity threshold
-            candidates = [c for c in candidates if c["score"] >= self.MIN_SIMILARITY_THRESHOLD]
+            # Step 3: Filter by similarity threshold. Vector results are
+            # already filtered server-side; this pass only trims low-scoring
+            # chunks that entered via the BM25/hybrid path
+            candidates = [c for c in candidates if c["score"] >= relevance_threshold]
             
             # Step 4: Re-rank top candidates
             if use_reranking and self.reranker:
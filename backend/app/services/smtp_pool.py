@@ -0,0 +1,156 @@
+"""Process-wide SMTP connection pool with keepalive.
+
+Opening an SMTP session costs a TCP handshake, a TLS negotiation, and an
+AUTH exchange — hundreds of milliseconds per message when every send
+builds a fresh connection. The pool keeps authenticated connections warm
+per (host, port, user) and hands them out for reuse, verifying liveness
+with a NOOP before each send and retiring connections after a message
+quota so providers don't see one immortal session.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Tuple
+
+import aiosmtplib
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Upper bounds per pool key: how many idle connections to keep warm, and
+# how many messages a single connection may carry before being retired
+MAX_CONNECTIONS_PER_KEY = 5
+MAX_MESSAGES_PER_CONNECTION = 100
+
+
+class _PooledConnection:
+    """An authenticated SMTP connection tagged with its send counter."""
+
+    def __init__(self, smtp: aiosmtplib.SMTP):
+        self.smtp = smtp
+        self.sent_count = 0
+
+
+class SMTPConnectionPool:
+    """Async pool of aiosmtplib connections keyed by (host, port, user)."""
+
+    def __init__(
+        self,
+        max_connections: int = MAX_CONNECTIONS_PER_KEY,
+        max_messages: int = MAX_MESSAGES_PER_CONNECTION,
+    ):
+        self.max_connections = max_connections
+        self.max_messages = max_messages
+        self._pools: Dict[Tuple[str, int, str], asyncio.Queue] = {}
+        self._lock = asyncio.Lock()
+
+    async def _get_queue(self, key: Tuple[str, int, str]) -> asyncio.Queue:
+        """Get or create the idle-connection queue for a pool key."""
+        async with self._lock:
+            queue = self._pools.get(key)
+            if queue is None:
+                queue = asyncio.Queue(maxsize=self.max_connections)
+                self._pools[key] = queue
+            return queue
+
+    async def _connect(
+        self,
+        smtp_host: str,
+        smtp_port: int,
+        smtp_user: str,
+        smtp_password: str,
+        use_tls: bool,
+    ) -> _PooledConnection:
+        """Open and authenticate a fresh SMTP connection."""
+        smtp = aiosmtplib.SMTP(
+            hostname=smtp_host,
+            port=smtp_port,
+            start_tls=use_tls,
+        )
+        await smtp.connect()
+        await smtp.login(smtp_user, smtp_password)
+        logger.info("smtp_pool_connection_opened", host=smtp_host, user=smtp_user)
+        return _PooledConnection(smtp)
+
+    @staticmethod
+    async def _close_quietly(conn: _PooledConnection) -> None:
+        """Close a connection, swallowing errors on already-dead sockets."""
+        try:
+            await conn.smtp.quit()
+        except Exception:
+            pass
+
+    @asynccontextmanager
+    async def acquire(
+        self,
+        smtp_host: str,
+        smtp_port: int,
+        smtp_user: str,
+        smtp_password: str,
+        use_tls: bool = True,
+    ) -> AsyncIterator[aiosmtplib.SMTP]:
+        """
+        Acquire a warm SMTP connection for the given credentials.
+
+        Pops an idle connection and verifies it with NOOP (reconnecting on
+        failure), or opens a new one if the pool is empty. On clean exit
+        the connection goes back to the pool unless it has hit its message
+        quota; on error it is discarded so a poisoned session is never
+        reused.
+        """
+        key = (smtp_host, smtp_port, smtp_user)
+        queue = await self._get_queue(key)
+
+        conn: _PooledConnection | None = None
+        while conn is None:
+            try:
+                candidate = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            # Health check: a pooled connection may have been dropped by the
+            # server while idle; NOOP catches that before we trust it
+            try:
+                await candidate.smtp.noop()
+                conn = candidate
+            except Exception:
+                logger.info("smtp_pool_stale_connection_dropped", host=smtp_host)
+                await self._close_quietly(candidate)
+
+        if conn is None:
+            conn = await self._connect(
+                smtp_host, smtp_port, smtp_user, smtp_password, use_tls
+            )
+
+        try:
+            yield conn.smtp
+        except Exception:
+            await self._close_quietly(conn)
+            raise
+        else:
+            conn.sent_count += 1
+            if conn.sent_count >= self.max_messages or not conn.smtp.is_connected:
+                await self._close_quietly(conn)
+            else:
+                try:
+                    queue.put_nowait(conn)
+                except asyncio.QueueFull:
+                    await self._close_quietly(conn)
+
+    async def close(self) -> None:
+        """Gracefully QUIT all pooled connections (call on app shutdown)."""
+        async with self._lock:
+            pools = list(self._pools.values())
+            self._pools.clear()
+        for queue in pools:
+            while True:
+                try:
+                    conn = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                await self._close_quietly(conn)
+        logger.info("smtp_pool_closed")
+
+
+# Global SMTP pool instance
+smtp_pool = SMTPConnectionPool()
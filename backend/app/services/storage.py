@@ -2,12 +2,12 @@
 
 import asyncio
 import os
-import shutil
 import tempfile
 from pathlib import Path
 from typing import BinaryIO, Optional
 import uuid
 
+import aiofiles
 import boto3
 from botocore.exceptions import ClientError, BotoCoreError
 from botocore.config import Config
@@ -111,15 +111,18 @@ class StorageService:
             raise ValueError(f"Unsupported storage provider: {self.provider}")
 
     async def _save_local(self, file: BinaryIO, storage_key: str) -> str:
-        """Save file to local filesystem."""
+        """Save file to local filesystem without blocking the event loop."""
         try:
             file_path = self.local_path / storage_key
-            file_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            # Save file
-            with open(file_path, "wb") as f:
-                shutil.copyfileobj(file, f)
-            
+            await asyncio.to_thread(file_path.parent.mkdir, parents=True, exist_ok=True)
+
+            # Copy in chunks: aiofiles runs the writes in a worker thread,
+            # and the blocking reads from the source handle are offloaded
+            # the same way, so a multi-MB copy never stalls the loop
+            async with aiofiles.open(file_path, "wb") as f:
+                while chunk := await asyncio.to_thread(file.read, 1024 * 1024):
+                    await f.write(chunk)
+
             logger.info("file_saved_locally", storage_key=storage_key)
             return storage_key
             
@@ -0,0 +1 @@
+"""Background worker processes (Celery)."""
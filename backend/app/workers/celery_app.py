@@ -0,0 +1,113 @@
+"""Celery application for durable document processing.
+
+Runs ingestion on dedicated worker processes instead of inside the web
+workers, so embedding-heavy jobs don't compete with request handling for
+CPU or event-loop time, and jobs survive a web-process restart.
+
+Start a worker with:
+    celery -A app.workers.celery_app worker --loglevel=info
+"""
+
+import asyncio
+
+from celery import Celery
+
+from app.core.config import settings
+
+celery_app = Celery(
+    "agentic_workspace",
+    broker=settings.REDIS_URL,
+    backend=settings.REDIS_URL,
+)
+
+celery_app.conf.update(
+    task_serializer="json",
+    accept_content=["json"],
+    result_serializer="json",
+    # Ack after completion so a worker crash requeues the job instead of
+    # dropping it
+    task_acks_late=True,
+    worker_prefetch_multiplier=1,
+)
+
+
+@celery_app.task(name="process_document", max_retries=3, default_retry_delay=30)
+def process_document_task(document_id: int, file_path: str, file_type: str):
+    """Process an uploaded document on a worker (idempotent per document)."""
+    # Import here so the web process can enqueue without pulling in the
+    # ingestion stack (embedding model etc.)
+    from pathlib import Path
+
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+    from sqlalchemy.pool import NullPool
+
+    from app.services.ingestion import ingestion_service
+
+    async def _run() -> None:
+        # Each task runs in its own short-lived event loop, so the shared
+        # pooled engine is off-limits: a connection checked in from one
+        # task's loop would be handed to the next task bound to a dead
+        # loop, failing in a way pool_pre_ping can't classify. NullPool
+        # opens and closes a real connection per task instead.
+        engine = create_async_engine(str(settings.DATABASE_URL), poolclass=NullPool)
+        session_factory = async_sessionmaker(
+            engine, class_=AsyncSession, expire_on_commit=False
+        )
+        try:
+            async with session_factory() as db:
+                await ingestion_service.process_document(
+                    db=db,
+                    document_id=document_id,
+                    file_path=Path(file_path),
+                    file_type=file_type,
+                )
+        finally:
+            await engine.dispose()
+
+    asyncio.run(_run())
+
+
+@celery_app.task(
+    name="send_email",
+    # EmailClient normalizes SMTP failures to ValueError; transient server
+    # hiccups retry with exponential backoff instead of losing the mail
+    autoretry_for=(ValueError,),
+    retry_backoff=True,
+    max_retries=5,
+)
+def send_email_task(
+    smtp_host: str,
+    smtp_port: int,
+    smtp_user: str,
+    smtp_password: str,
+    use_tls: bool,
+    to_emails: list[str],
+    subject: str,
+    body: str,
+    body_html: str | None = None,
+    cc_emails: list[str] | None = None,
+    bcc_emails: list[str] | None = None,
+):
+    """Send an email from a worker process using the pooled SMTP client."""
+    from app.integrations.email_client import EmailClient
+
+    client = EmailClient(
+        smtp_host=smtp_host,
+        smtp_port=smtp_port,
+        smtp_user=smtp_user,
+        smtp_password=smtp_password,
+        use_tls=use_tls,
+    )
+    # _send_direct bypasses both the enqueue branch (the worker is the
+    # consumer) and the shared SMTP pool, whose connections would be bound
+    # to this task's soon-to-be-closed event loop
+    return asyncio.run(
+        client._send_direct(
+            to_emails=to_emails,
+            subject=subject,
+            body=body,
+            body_html=body_html,
+            cc_emails=cc_emails,
+            bcc_emails=bcc_emails,
+        )
+    )
@@ -0,0 +1,72 @@
+"""Build the optional IVFFlat index on chunks.embedding.
+
+At >1M vectors IVFFlat builds ~30x faster than HNSW at lower QPS — a
+better fit for bulk/analytical scans than the latency-tuned HNSW index.
+Opt-in via settings.ENABLE_IVFFLAT_INDEX; the index lives outside
+migration history so enabling the flag on an already-migrated database
+just means running this script (see the 20241214_ivfflat revision).
+
+lists is sized as sqrt(row count), the standard starting point; rebuild
+after large ingests so it tracks table growth.
+
+Usage:
+    python scripts/build_ivfflat_index.py
+"""
+
+import asyncio
+import math
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import asyncpg
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+def _asyncpg_dsn() -> str:
+    """SQLAlchemy URL -> plain asyncpg DSN."""
+    return str(settings.DATABASE_URL).replace("postgresql+asyncpg://", "postgresql://")
+
+
+async def build_ivfflat_index():
+    """Create (or refresh) the IVFFlat index sized from the current row count."""
+    if not settings.ENABLE_IVFFLAT_INDEX:
+        print("ENABLE_IVFFLAT_INDEX is off; nothing to do.")
+        return
+
+    conn = await asyncpg.connect(_asyncpg_dsn())
+    try:
+        count = await conn.fetchval('SELECT count(*) FROM chunks') or 0
+        # sqrt(N) lists is the standard starting point; floor at 10 for tiny tables
+        lists = max(10, int(math.sqrt(count)))
+
+        # CONCURRENTLY is rejected on partitioned parents (same constraint
+        # reingest_chunks.py handles), so probe before choosing
+        partitioned = await conn.fetchval(
+            "SELECT count(*) FROM pg_inherits WHERE inhparent = 'chunks'::regclass"
+        )
+        concurrently = "" if partitioned else "CONCURRENTLY"
+
+        await conn.execute("SET maintenance_work_mem = '2GB'")
+        await conn.execute('SET max_parallel_maintenance_workers = 7')
+        await conn.execute(f"""
+            CREATE INDEX {concurrently} IF NOT EXISTS ix_chunks_embedding_ivfflat
+            ON chunks
+            USING ivfflat (embedding halfvec_cosine_ops)
+            WITH (lists = {lists})
+        """)
+
+        logger.info("ivfflat_index_built", rows=count, lists=lists)
+        print(f"✅ IVFFlat index ready over {count} rows (lists = {lists}).")
+    finally:
+        await conn.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(build_ivfflat_index())
@@ -0,0 +1,197 @@
+"""Re-embed and bulk-load all chunks after an embedding-dimension migration.
+
+The dimension-change migrations TRUNCATE chunks; this script rebuilds them.
+Row-by-row INSERTs would dominate total migration time, so it:
+
+1. Reads each completed document from storage and re-chunks it
+2. Runs the SentenceTransformer encoder on batches of 64 texts
+3. Streams rows into Postgres with asyncpg's binary COPY
+   (copy_records_to_table), avoiding per-row parse cost
+4. Drops the HNSW index before the load and rebuilds it afterwards
+   (CONCURRENTLY when chunks is a plain table; partitioned parents
+   don't allow it) — one bulk build beats N incremental inserts
+5. Flips chunks (or each partition) to UNLOGGED for the duration of the
+   load, skipping WAL write amplification — roughly half of total I/O
+
+WARNING: the table is not crash-safe while UNLOGGED; point-in-time
+recovery does not cover the load window. Rows are fsynced back into WAL
+when the table is set LOGGED again.
+
+Usage:
+    alembic upgrade head && python scripts/reingest_chunks.py
+"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import asyncpg
+from pgvector.asyncpg import register_vector
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.services.ingestion import ingestion_service
+from app.services.storage import storage_service
+
+logger = get_logger(__name__)
+
+ENCODE_BATCH_SIZE = 64
+DOC_BATCH_SIZE = 10_000
+
+# CONCURRENTLY is rejected on a partitioned parent, so it's spliced in
+# only when chunks is a plain table. The plain build on a partitioned
+# chunks is acceptable: the table was just truncated and is UNLOGGED for
+# the load, so nothing else is reading it during this window anyway.
+HNSW_INDEX_SQL = """
+    CREATE INDEX {concurrently} IF NOT EXISTS ix_chunks_embedding_hnsw
+    ON chunks
+    USING hnsw (embedding halfvec_cosine_ops)
+    WITH (m = 24, ef_construction = 128)
+"""
+
+
+async def _chunk_partitions(conn: asyncpg.Connection) -> list[str]:
+    """Partition names of chunks, or an empty list if it's a plain table."""
+    rows = await conn.fetch("""
+        SELECT c.relname FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = 'chunks'::regclass
+    """)
+    return [r['relname'] for r in rows]
+
+
+async def _set_wal_logging(conn: asyncpg.Connection, logged: bool) -> None:
+    """Toggle WAL logging on chunks, or on each partition if it's partitioned.
+
+    SET UNLOGGED is not allowed on a partitioned parent, so partitions are
+    flipped individually.
+    """
+    tables = await _chunk_partitions(conn) or ['chunks']
+    keyword = 'LOGGED' if logged else 'UNLOGGED'
+    for table in tables:
+        await conn.execute(f'ALTER TABLE {table} SET {keyword}')
+
+
+def _asyncpg_dsn() -> str:
+    """SQLAlchemy URL -> plain asyncpg DSN."""
+    return str(settings.DATABASE_URL).replace("postgresql+asyncpg://", "postgresql://")
+
+
+async def _build_records(document: asyncpg.Record) -> list[tuple]:
+    """Parse, chunk, and batch-encode one document into COPY-ready records."""
+    file_path = storage_service.local_path / document["storage_key"]
+    if not file_path.exists():
+        logger.warning("document_file_missing", document_id=document["id"], storage_key=document["storage_key"])
+        return []
+
+    with open(file_path, "rb") as f:
+        text = await ingestion_service.parse_document(f, document["file_type"])
+
+    chunk_data_list = ingestion_service.chunk_text(text, {"document_id": document["id"]})
+    if not chunk_data_list:
+        return []
+
+    # Batch-encode: the encoder amortizes tokenization and matmul across the batch
+    contents = [c["content"][:5000] for c in chunk_data_list]
+    embeddings = []
+    for start in range(0, len(contents), ENCODE_BATCH_SIZE):
+        batch = contents[start:start + ENCODE_BATCH_SIZE]
+        embeddings.extend(ingestion_service.embeddings.encode(batch, convert_to_tensor=False))
+
+    return [
+        (
+            document["id"],
+            chunk_data["content"],
+            embedding.tolist(),
+            json.dumps({
+                **chunk_data["metadata"],
+                "chunk_index": idx,
+                "chunk_size": len(chunk_data["content"]),
+            }),
+        )
+        for idx, (chunk_data, embedding) in enumerate(zip(chunk_data_list, embeddings))
+    ]
+
+
+async def reingest_chunks():
+    """Re-embed every completed document and bulk-load chunks via binary COPY."""
+    conn = await asyncpg.connect(_asyncpg_dsn())
+    try:
+        # pgvector codecs let COPY send embeddings in binary format directly
+        await register_vector(conn)
+        await conn.set_type_codec(
+            "json", encoder=lambda v: v, decoder=json.loads, schema="pg_catalog"
+        )
+
+        # Row-number range batching: OFFSET/LIMIT re-scans the prefix on every
+        # page (O(N^2) over the run), while rn ranges over this indexed temp
+        # table keep each batch O(batch_size) regardless of position
+        await conn.execute("""
+            CREATE TEMP TABLE doc_batch AS
+            SELECT id, ROW_NUMBER() OVER (ORDER BY id) AS rn
+            FROM documents WHERE status = 'COMPLETED'
+        """)
+        await conn.execute('CREATE INDEX ON doc_batch (rn)')
+        total_docs = await conn.fetchval('SELECT count(*) FROM doc_batch')
+
+        if not total_docs:
+            print("No completed documents to re-ingest.")
+            return
+
+        # One bulk index build after the load beats N incremental inserts.
+        # Postgres forbids CONCURRENTLY on partitioned tables and their
+        # indexes, so fall back to plain DROP/CREATE when chunks is one.
+        concurrently = "" if await _chunk_partitions(conn) else "CONCURRENTLY"
+        await conn.execute(
+            f"DROP INDEX {concurrently} IF EXISTS ix_chunks_embedding_hnsw"
+        )
+
+        # Skip WAL during the bulk load (see module docstring for the
+        # recovery caveat)
+        await _set_wal_logging(conn, logged=False)
+
+        total_chunks = 0
+        lo = 1
+        while lo <= total_docs:
+            documents = await conn.fetch("""
+                SELECT d.id, d.file_type, d.storage_key
+                FROM documents d
+                JOIN doc_batch b ON b.id = d.id
+                WHERE b.rn BETWEEN $1 AND $2
+                ORDER BY b.rn
+            """, lo, lo + DOC_BATCH_SIZE - 1)
+
+            for document in documents:
+                records = await _build_records(document)
+                if not records:
+                    continue
+                await conn.copy_records_to_table(
+                    "chunks",
+                    records=records,
+                    columns=("document_id", "content", "embedding", "chunk_metadata"),
+                )
+                total_chunks += len(records)
+                logger.info("document_reingested", document_id=document["id"], chunks=len(records))
+
+            lo += DOC_BATCH_SIZE
+
+        # Restore crash safety before the index build; this write-backs the
+        # loaded rows into WAL once, instead of per-row during the COPY
+        await _set_wal_logging(conn, logged=True)
+
+        await conn.execute("SET maintenance_work_mem = '2GB'")
+        await conn.execute("SET max_parallel_maintenance_workers = 7")
+        await conn.execute(HNSW_INDEX_SQL.format(concurrently=concurrently))
+        await conn.execute('DROP TABLE doc_batch')
+
+        print(f"\n✅ Re-ingested {total_chunks} chunks from {total_docs} documents.")
+    finally:
+        await conn.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(reingest_chunks())
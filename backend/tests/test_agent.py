@@ -0,0 +1,45 @@
+"""Tests for agent endpoints."""
+
+import pytest
+from httpx import AsyncClient
+
+
+@pytest.mark.asyncio
+async def test_get_report_malformed_id(test_client: AsyncClient, auth_headers: dict):
+    """Report ids that aren't hex tokens are rejected before filesystem access."""
+    response = await test_client.get(
+        "/api/v1/agent/reports/not-a-report",
+        headers=auth_headers,
+    )
+
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_get_report_traversal_id_rejected(test_client: AsyncClient, auth_headers: dict):
+    """A dot-laden id can never reach path construction."""
+    response = await test_client.get(
+        "/api/v1/agent/reports/........",
+        headers=auth_headers,
+    )
+
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_get_report_nonexistent(test_client: AsyncClient, auth_headers: dict):
+    """A well-formed id with no file behind it returns 404."""
+    response = await test_client.get(
+        "/api/v1/agent/reports/deadbeefdeadbeef",
+        headers=auth_headers,
+    )
+
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_get_report_unauthorized(test_client: AsyncClient):
+    """Report download without authentication is rejected."""
+    response = await test_client.get("/api/v1/agent/reports/deadbeefdeadbeef")
+
+    assert response.status_code == 401
@@ -111,3 +111,86 @@ async def test_get_nonexistent_document(test_client: AsyncClient, auth_headers:
     
     assert response.status_code == 404
 
+
+
+@pytest.mark.asyncio
+async def test_upload_duplicate_returns_existing_document(
+    test_client: AsyncClient, auth_headers: dict
+):
+    """Re-uploading identical bytes returns the existing document."""
+    file_content = b"Duplicate upload detection content."
+    files = {"file": ("original.txt", io.BytesIO(file_content), "text/plain")}
+    first = await test_client.post(
+        "/api/v1/documents/upload",
+        files=files,
+        headers=auth_headers,
+    )
+    assert first.status_code == 201
+
+    files = {"file": ("original.txt", io.BytesIO(file_content), "text/plain")}
+    second = await test_client.post(
+        "/api/v1/documents/upload",
+        files=files,
+        headers=auth_headers,
+    )
+
+    assert second.status_code == 201
+    assert second.json()["id"] == first.json()["id"]
+
+
+@pytest.mark.asyncio
+async def test_upload_duplicate_keeps_original_filename(
+    test_client: AsyncClient, auth_headers: dict
+):
+    """Dedup matches on content, so a renamed re-upload still returns the original."""
+    file_content = b"Same bytes, different filename."
+    files = {"file": ("original.txt", io.BytesIO(file_content), "text/plain")}
+    first = await test_client.post(
+        "/api/v1/documents/upload",
+        files=files,
+        headers=auth_headers,
+    )
+    assert first.status_code == 201
+
+    files = {"file": ("renamed.txt", io.BytesIO(file_content), "text/plain")}
+    second = await test_client.post(
+        "/api/v1/documents/upload",
+        files=files,
+        headers=auth_headers,
+    )
+
+    assert second.status_code == 201
+    data = second.json()
+    assert data["id"] == first.json()["id"]
+    assert data["filename"] == "original.txt"
+
+
+@pytest.mark.asyncio
+async def test_upload_after_failure_reprocesses(
+    test_client: AsyncClient, auth_headers: dict, db_session
+):
+    """A failed ingestion doesn't dedup-block re-uploading the same bytes."""
+    from app.models.document import Document, DocumentStatus
+
+    file_content = b"Content whose first ingestion failed."
+    files = {"file": ("retry.txt", io.BytesIO(file_content), "text/plain")}
+    first = await test_client.post(
+        "/api/v1/documents/upload",
+        files=files,
+        headers=auth_headers,
+    )
+    assert first.status_code == 201
+
+    document = await db_session.get(Document, first.json()["id"])
+    document.status = DocumentStatus.FAILED
+    await db_session.commit()
+
+    files = {"file": ("retry.txt", io.BytesIO(file_content), "text/plain")}
+    second = await test_client.post(
+        "/api/v1/documents/upload",
+        files=files,
+        headers=auth_headers,
+    )
+
+    assert second.status_code == 201
+    assert second.json()["id"] != first.json()["id"]
@@ -0,0 +1,42 @@
+"""Tests for RAG endpoints."""
+
+import pytest
+from httpx import AsyncClient
+
+from app.services.answer_engine import CANNED_RESPONSES
+
+
+@pytest.mark.asyncio
+async def test_query_conversational_greeting(test_client: AsyncClient, auth_headers: dict):
+    """A greeting gets its canned response without touching retrieval."""
+    response = await test_client.post(
+        "/api/v1/rag/query",
+        json={"query": "hello"},
+        headers=auth_headers,
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["answer"] == CANNED_RESPONSES["greeting"]
+    assert data["sources"] == []
+
+
+@pytest.mark.asyncio
+async def test_query_conversational_thanks(test_client: AsyncClient, auth_headers: dict):
+    """A thanks message maps to the thanks canned response."""
+    response = await test_client.post(
+        "/api/v1/rag/query",
+        json={"query": "thanks!"},
+        headers=auth_headers,
+    )
+
+    assert response.status_code == 200
+    assert response.json()["answer"] == CANNED_RESPONSES["thanks"]
+
+
+@pytest.mark.asyncio
+async def test_query_unauthorized(test_client: AsyncClient):
+    """Query without authentication is rejected."""
+    response = await test_client.post("/api/v1/rag/query", json={"query": "hello"})
+
+    assert response.status_code == 401
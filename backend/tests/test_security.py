@@ -16,7 +16,17 @@ def test_hash_password():
     
     assert hashed != password
     assert len(hashed) > 0
-    assert hashed.startswith("$2b$")  # bcrypt hash format
+    assert hashed.startswith("$argon2")  # argon2 hash format
+
+
+def test_verify_password_legacy_bcrypt():
+    """Test that pre-existing bcrypt hashes still verify."""
+    from passlib.hash import bcrypt
+
+    password = "testpassword123"
+    legacy_hash = bcrypt.hash(password)
+
+    assert verify_password(password, legacy_hash) is True
 
 
 def test_verify_password():